@@ -0,0 +1,177 @@
+"""캐러셀 ZIP 스트리밍 작성기
+
+카드가 완성될 때마다 바로 ZIP에 써 넣고, 전체 크기가 기준을 넘으면 메모리 버퍼를
+임시 파일로 옮긴다. 완성된 ZIP은 bytes 사본 대신 memoryview·파일 핸들·청크 단위로 내준다.
+PNG·JPEG·WebP처럼 이미 압축된 항목은 다시 압축하지 않고 그대로(ZIP_STORED) 저장한다.
+"""
+
+import io
+import os
+import tempfile
+import threading
+import zipfile
+
+from tracing import span
+
+# 이 크기를 넘으면 ZIP을 메모리 대신 임시 파일에 기록
+ZIP_SPOOL_BYTES = int(os.environ.get("CARDNEWS_ZIP_SPOOL_MB", "32")) * 1024 * 1024
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# 이미 압축된 형식 (deflate를 한 번 더 해도 크기는 거의 그대로이고 시간만 듦)
+PRECOMPRESSED_MIME_TYPES = {
+    "image/png",
+    "image/jpeg",
+    "image/webp",
+    "application/zip",
+    "application/gzip"
+}
+
+
+def member_compression(mime):
+    """ZIP 항목 압축 방식 (이미 압축된 형식은 STORED, 텍스트 등은 DEFLATED)"""
+    return zipfile.ZIP_STORED if mime in PRECOMPRESSED_MIME_TYPES else zipfile.ZIP_DEFLATED
+
+
+class SpillBuffer:
+    """처음에는 메모리(BytesIO)에 쓰다가 max_memory를 넘으면 임시 파일로 옮기는 버퍼"""
+
+    def __init__(self, max_memory=ZIP_SPOOL_BYTES):
+        self.max_memory = max_memory
+        self.spilled = False
+        self._file = io.BytesIO()
+
+    def _spill(self):
+        spill = tempfile.TemporaryFile(prefix="cardnews-zip-")
+        position = self._file.tell()
+        spill.write(self._file.getbuffer())
+        spill.seek(position)
+        self._file = spill
+        self.spilled = True
+
+    def write(self, data):
+        if not self.spilled and self._file.tell() + len(data) > self.max_memory:
+            self._spill()
+        return self._file.write(data)
+
+    def read(self, size=-1):
+        return self._file.read(size)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        return self._file.seek(offset, whence)
+
+    def tell(self):
+        return self._file.tell()
+
+    def seekable(self):
+        return True
+
+    def fileno(self):
+        return self._file.fileno()
+
+    def getbuffer(self):
+        """메모리 버퍼의 memoryview (임시 파일로 옮겨졌으면 None)"""
+        return None if self.spilled else self._file.getbuffer()
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class CarouselArchive:
+    """카드를 렌더링되는 대로 추가하는 ZIP
+
+    fileobj를 주면 그 파일에 바로 쓰고(배치 출력 등), 없으면 SpillBuffer에 쓴다.
+    close() 뒤에 size·getbuffer()·open()·iter_chunks()로 결과를 꺼낸다.
+    """
+
+    def __init__(self, fileobj=None, spool_bytes=None):
+        self._owns_buffer = fileobj is None
+        self._buffer = fileobj if fileobj is not None else SpillBuffer(
+            ZIP_SPOOL_BYTES if spool_bytes is None else spool_bytes
+        )
+        self._zip = zipfile.ZipFile(self._buffer, 'w', zipfile.ZIP_DEFLATED)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.size = None
+
+    def add(self, rendered):
+        """렌더링된 카드 하나를 바로 ZIP에 기록 (인코더가 만든 바이트를 복사 없이 그대로 씀)"""
+        with span("zip.add"):
+            self.add_member(rendered['filename'], rendered['image_bytes'], rendered['mime'])
+        self.count += 1
+
+    def add_member(self, name, data, mime="application/octet-stream"):
+        """항목 하나 기록 (압축 여부는 mime으로 결정)"""
+        self._zip.writestr(name, data, compress_type=member_compression(mime))
+
+    def add_text(self, name, text, mime="text/plain"):
+        """텍스트 항목 기록 (매니페스트 등, 압축해서 저장)"""
+        self.add_member(name, text.encode('utf-8'), mime)
+
+    def close(self):
+        """중앙 디렉터리를 기록해 ZIP 완성 (여러 번 호출해도 됨)"""
+        if self._zip is not None:
+            with span("zip.close"):
+                self._zip.close()
+            self._zip = None
+            self.size = self._buffer.seek(0, io.SEEK_END)
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def spilled(self):
+        return self._owns_buffer and self._buffer.spilled
+
+    def getbuffer(self):
+        """메모리에 있는 ZIP 전체의 memoryview (임시 파일로 옮겨졌으면 None)"""
+        self.close()
+        if not self._owns_buffer or self._buffer.spilled:
+            return None
+        return self._buffer.getbuffer()[:self.size]
+
+    def open(self):
+        """처음 위치의 읽기용 파일 핸들 (메모리면 BytesIO, 임시 파일이면 BufferedReader)
+
+        st.download_button처럼 한 번만 읽는 소비자용이다. 임시 파일 핸들은 내부 파일과
+        읽기 위치를 공유하므로 여러 스레드에서 동시에 읽을 때는 iter_chunks()를 쓴다.
+        """
+        self.close()
+        if not self._owns_buffer:
+            stream = self._buffer
+        elif self._buffer.spilled:
+            stream = open(os.dup(self._buffer.fileno()), 'rb')
+        else:
+            stream = self._buffer._file
+        stream.seek(0)
+        return stream
+
+    def iter_chunks(self, chunk_size=COPY_CHUNK_SIZE):
+        """ZIP 내용을 청크 단위로 반환 (HTTP 응답·파일 복사용, 여러 스레드에서 동시에 써도 됨)"""
+        view = self.getbuffer()
+        if view is not None:
+            for start in range(0, self.size, chunk_size):
+                yield view[start:start + chunk_size]
+            return
+
+        position = 0
+        while position < self.size:
+            with self._lock:
+                self._buffer.seek(position)
+                chunk = self._buffer.read(min(chunk_size, self.size - position))
+            if not chunk:
+                return
+            position += len(chunk)
+            yield chunk
+
+    def discard(self):
+        """버퍼와 임시 파일 정리 (직접 받은 fileobj는 닫지 않음)"""
+        self.close()
+        if self._owns_buffer:
+            self._buffer.close()
@@ -0,0 +1,364 @@
+"""매니페스트(JSONL/CSV) 기반 캐러셀 일괄 생성 CLI (Streamlit 없이 실행)
+
+사용법:
+    python batch.py jobs.jsonl --out output/ [--zip] [--workers 4]
+
+매니페스트 한 줄(행)이 캐러셀 하나이며 다음 필드를 사용한다.
+    id(선택), title, subtitle, content, platform, theme, background_type, max_cards,
+    encoder(선택, 기본은 플랫폼별 프로필), width/height(선택, platform이 "Custom Size"일 때만 지정 가능)
+
+완료된 작업은 출력 디렉터리의 checkpoint.jsonl에 기록되므로,
+중간에 멈춘 실행을 같은 명령으로 다시 시작하면 끝난 작업은 건너뛴다.
+"""
+
+import argparse
+import csv
+import json
+import logging
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from archive import CarouselArchive
+from cardnews import (
+    PLATFORM_SIZES,
+    fetch_card_backgrounds,
+    render_carousel_card,
+    split_content_into_cards
+)
+from encoders import ENCODER_PROFILES, get_platform_encoder
+from reporting import LoggingReporter, get_reporter, set_reporter
+from tracing import capture_trace, trace_job
+from warmup import describe, warm_up
+
+CHECKPOINT_NAME = "checkpoint.jsonl"
+MANIFEST_NAME = "manifest.json"
+# 결과와 함께 저장하는 단계별 시간 추적
+TRACE_NAME = "trace.json"
+
+# 앱 입력 폼과 같은 허용 범위 (서비스가 받은 뒤 작업 스레드에서 실패하지 않도록 접수 시 검사)
+BACKGROUND_TYPES = ("ai", "gradient")
+MAX_CARDS_RANGE = (3, 8)
+CUSTOM_SIZE_RANGE = (400, 2000)
+
+logger = logging.getLogger("batch")
+
+
+def current_umask():
+    """프로세스 umask (읽으려면 한 번 바꿨다 되돌려야 하므로 시작 시 한 번만 호출)"""
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# 임시 파일·디렉터리(mkstemp 0600, mkdtemp 0700)를 교체하기 전에 일반 파일과 같은 권한으로 맞춤
+OUTPUT_FILE_MODE = 0o666 & ~current_umask()
+OUTPUT_DIR_MODE = 0o777 & ~current_umask()
+
+
+def load_manifest(path):
+    """매니페스트 파일을 작업 목록으로 읽기 (.csv는 CSV, 그 외는 JSONL)"""
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            rows = list(csv.DictReader(f))
+    else:
+        with open(path, encoding='utf-8') as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+
+    return [normalize_job(row, index) for index, row in enumerate(rows, 1)]
+
+
+def parse_bounded_int(value, name, bounds, index):
+    """정수 필드 읽기 (범위를 벗어나면 ValueError)"""
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{index}번째 작업: {name}은(는) 정수여야 합니다 ('{value}')")
+    low, high = bounds
+    if not low <= number <= high:
+        raise ValueError(f"{index}번째 작업: {name}은(는) {low}~{high} 범위여야 합니다 ({number})")
+    return number
+
+
+def normalize_job(row, index):
+    """매니페스트 행에 기본값을 채우고 작업 ID 부여 (렌더링할 수 없는 값이면 ValueError)"""
+    background_type = str(row.get('background_type') or "ai").strip()
+    if background_type not in BACKGROUND_TYPES:
+        raise ValueError(f"{index}번째 작업: 알 수 없는 배경 타입 '{background_type}' (사용 가능: {', '.join(BACKGROUND_TYPES)})")
+    platform = str(row.get('platform') or "Instagram Carousel").strip()
+    if platform not in PLATFORM_SIZES:
+        raise ValueError(f"{index}번째 작업: 알 수 없는 플랫폼 '{platform}'")
+
+    width, height, _ = PLATFORM_SIZES[platform]
+    if row.get('width') or row.get('height'):
+        if platform != "Custom Size":
+            raise ValueError(f"{index}번째 작업: width/height는 platform이 'Custom Size'일 때만 지정할 수 있습니다")
+        width = parse_bounded_int(row.get('width') or width, "width", CUSTOM_SIZE_RANGE, index)
+        height = parse_bounded_int(row.get('height') or height, "height", CUSTOM_SIZE_RANGE, index)
+
+    encoder = str(row.get('encoder') or get_platform_encoder(platform)).strip()
+    if encoder not in ENCODER_PROFILES:
+        raise ValueError(f"{index}번째 작업: 알 수 없는 인코더 프로필 '{encoder}'")
+
+    job_id = str(row.get('id') or f"job-{index:06d}")
+    # 파일 이름으로 쓸 수 없는 문자 제거
+    job_id = re.sub(r'[^\w.-]+', '_', job_id).strip('._') or f"job-{index:06d}"
+
+    return {
+        'id': job_id,
+        'title': row.get('title') or "",
+        'subtitle': row.get('subtitle') or "",
+        'content': row.get('content') or "",
+        'platform': platform,
+        'width': width,
+        'height': height,
+        'background_type': background_type,
+        'theme': row.get('theme') or ("비즈니스" if background_type == "ai" else "블루 그라데이션"),
+        'max_cards': parse_bounded_int(row.get('max_cards') or 5, "max_cards", MAX_CARDS_RANGE, index),
+        'encoder': encoder
+    }
+
+
+def load_checkpoint(out_dir):
+    """이미 완료된 작업 ID 집합"""
+    path = Path(out_dir) / CHECKPOINT_NAME
+    done = set()
+    if not path.exists():
+        return done
+
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # 기록 도중 중단되어 잘린 마지막 줄
+                continue
+            if entry.get('status') == "ok":
+                done.add(entry['id'])
+    return done
+
+
+def append_checkpoint(out_dir, entry):
+    """작업 결과 한 줄 기록 (바로 디스크에 반영)"""
+    with open(Path(out_dir) / CHECKPOINT_NAME, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def iter_job_cards(job):
+    """작업 하나의 카드를 렌더링되는 대로 하나씩 반환 (카드 수, 제너레이터)"""
+    if not job['title']:
+        raise ValueError("메인 제목(title)이 비어 있습니다")
+
+    cards_data = split_content_into_cards(job['title'], job['subtitle'], job['content'], job['max_cards'])
+    return len(cards_data), _render_cards(job, cards_data)
+
+
+def _render_cards(job, cards_data):
+    width, height = job['width'], job['height']
+
+    backgrounds = [None] * len(cards_data)
+    if job['background_type'] == "ai":
+        backgrounds = fetch_card_backgrounds(cards_data, job['theme'], width, height, style="blur")
+
+    for i, card_data in enumerate(cards_data):
+        rendered = render_carousel_card(
+            card_data,
+            i + 1,
+            len(cards_data),
+            job['background_type'],
+            job['theme'],
+            width,
+            height,
+            backgrounds[i],
+            job['encoder']
+        )
+        if rendered is None:
+            raise RuntimeError(f"카드 {i + 1} 생성 실패")
+        yield rendered
+
+
+def render_job(job):
+    """작업 하나의 카드 렌더링 결과 목록"""
+    _, cards = iter_job_cards(job)
+    return list(cards)
+
+
+def job_manifest(job, cards):
+    """결과와 함께 저장할 작업 매니페스트 (JSON 문자열)"""
+    return json.dumps({
+        'id': job['id'],
+        'title': job['title'],
+        'platform': job['platform'],
+        'size': [job['width'], job['height']],
+        'encoder': job['encoder'],
+        'cards': cards
+    }, ensure_ascii=False, indent=2)
+
+
+def manifest_entry(rendered):
+    """매니페스트의 카드 한 장 항목 (프로필 대신 일반 JPEG로 저장됐으면 encoder_fallback 포함)"""
+    entry = {
+        'card_number': rendered['card_number'],
+        'filename': rendered['filename'],
+        'bytes': rendered['encoding']['bytes'],
+        'encode_ms': round(rendered['encoding']['seconds'] * 1000, 1)
+    }
+    if rendered['encoding'].get('fallback'):
+        entry['encoder_fallback'] = rendered['encoding']['fallback']
+    return entry
+
+
+def write_job_output(job, rendered_cards, out_dir, as_zip):
+    """카드를 렌더링되는 대로 저장하고 (경로, 카드별 인코딩 정보 목록) 반환
+
+    임시 이름으로 쓴 뒤 교체해서 반쯤 쓰인 결과가 남지 않도록 한다.
+    ZIP은 카드마다 바로 파일에 기록하므로 카드 이미지를 메모리에 모아 두지 않는다.
+    마지막에 카드 목록을 담은 manifest.json과, 추적 중이면 단계별 시간을 담은 trace.json을 함께 저장한다.
+    """
+    trace = capture_trace()
+    out_dir = Path(out_dir)
+
+    if as_zip:
+        target = out_dir / f"{job['id']}.zip"
+        fd, tmp_path = tempfile.mkstemp(dir=out_dir, prefix=".tmp-", suffix=".zip")
+        encodings, entries = [], []
+        try:
+            os.fchmod(fd, OUTPUT_FILE_MODE)
+            with os.fdopen(fd, 'wb') as f, CarouselArchive(f) as archive:
+                for rendered in rendered_cards:
+                    archive.add(rendered)
+                    encodings.append(rendered['encoding'])
+                    entries.append(manifest_entry(rendered))
+                archive.add_text(MANIFEST_NAME, job_manifest(job, entries), "application/json")
+                if trace is not None:
+                    archive.add_text(TRACE_NAME, trace.to_json(), "application/json")
+            os.replace(tmp_path, target)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return str(target), encodings
+
+    target = out_dir / job['id']
+    tmp_dir = Path(tempfile.mkdtemp(dir=out_dir, prefix=".tmp-"))
+    encodings, entries = [], []
+    try:
+        tmp_dir.chmod(OUTPUT_DIR_MODE)
+        for rendered in rendered_cards:
+            (tmp_dir / rendered['filename']).write_bytes(rendered['image_bytes'])
+            encodings.append(rendered['encoding'])
+            entries.append(manifest_entry(rendered))
+        (tmp_dir / MANIFEST_NAME).write_text(job_manifest(job, entries), encoding='utf-8')
+        if trace is not None:
+            (tmp_dir / TRACE_NAME).write_text(trace.to_json(), encoding='utf-8')
+    except BaseException:
+        shutil.rmtree(tmp_dir)
+        raise
+    if target.exists():
+        shutil.rmtree(target)
+    os.replace(tmp_dir, target)
+    return str(target), encodings
+
+
+def run_job(job, out_dir, as_zip):
+    """작업 하나 실행 (작업 프로세스에서 호출, 예외는 결과로 돌려줌)"""
+    start = time.perf_counter()
+    try:
+        with trace_job(job['id']):
+            _, cards = iter_job_cards(job)
+            output, encodings = write_job_output(job, cards, out_dir, as_zip)
+        return {
+            'id': job['id'],
+            'status': "ok",
+            'cards': len(encodings),
+            'output': output,
+            'encoder': job['encoder'],
+            'encoded_bytes': sum(encoding['bytes'] for encoding in encodings),
+            'encode_seconds': round(sum(encoding['seconds'] for encoding in encodings), 3),
+            'seconds': round(time.perf_counter() - start, 3)
+        }
+    except Exception as e:
+        return {
+            'id': job['id'],
+            'status': "error",
+            'error': f"{type(e).__name__}: {e}",
+            'seconds': round(time.perf_counter() - start, 3)
+        }
+
+
+def run_batch(jobs, out_dir, as_zip=False, workers=1):
+    """완료되지 않은 작업만 실행하고 결과를 체크포인트에 기록, (성공, 실패, 건너뜀) 개수 반환"""
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+
+    done = load_checkpoint(out_dir)
+    pending = [job for job in jobs if job['id'] not in done]
+    skipped = len(jobs) - len(pending)
+    if skipped:
+        logger.info(f"체크포인트에서 완료된 작업 {skipped}개 건너뜀")
+
+    succeeded = failed = 0
+
+    def record(result):
+        nonlocal succeeded, failed
+        append_checkpoint(out_dir, result)
+        if result['status'] == "ok":
+            succeeded += 1
+            logger.info(
+                f"✅ {result['id']}: {result['cards']}장 ({result['seconds']}s, "
+                f"{result['encoder']} {result['encoded_bytes'] / 1024:.0f} KB / 인코딩 {result['encode_seconds']}s)"
+            )
+        else:
+            failed += 1
+            logger.warning(f"❌ {result['id']}: {result['error']}")
+
+    if workers <= 1:
+        for job in pending:
+            record(run_job(job, out_dir, as_zip))
+    else:
+        # spawn 방식에서도 작업 프로세스가 같은 Reporter를 쓰도록 초기화 시 등록
+        with ProcessPoolExecutor(max_workers=workers, initializer=set_reporter, initargs=(get_reporter(),)) as executor:
+            futures = [executor.submit(run_job, job, out_dir, as_zip) for job in pending]
+            for future in as_completed(futures):
+                record(future.result())
+
+    return succeeded, failed, skipped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="카드뉴스 캐러셀 일괄 생성 (Streamlit 없이 실행)")
+    parser.add_argument("manifest", help="작업 목록 (.jsonl 또는 .csv)")
+    parser.add_argument("--out", required=True, help="결과 저장 디렉터리")
+    parser.add_argument("--zip", action="store_true", help="작업마다 ZIP 하나로 저장 (기본: 작업별 디렉터리에 카드 이미지)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="동시에 실행할 프로세스 수")
+    parser.add_argument("-v", "--verbose", action="store_true", help="작업별 진행 상황 출력")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format="%(message)s")
+    # 코어 경고는 로그로 출력 (작업 프로세스는 run_batch에서 따로 등록)
+    set_reporter(LoggingReporter())
+    if args.verbose:
+        logger.setLevel(logging.INFO)
+        # 코어 모듈의 카드별 정보 메시지는 너무 많으므로 경고만 출력
+        logging.getLogger("cardnews").setLevel(logging.WARNING)
+
+    jobs = load_manifest(args.manifest)
+    # 폰트 설치·캐시 준비 (작업 프로세스는 fork로 준비된 캐시를 물려받음)
+    readiness = warm_up()
+    if args.verbose:
+        logger.info(describe(readiness))
+    start = time.perf_counter()
+    succeeded, failed, skipped = run_batch(jobs, args.out, args.zip, args.workers)
+
+    print(f"완료 {succeeded} / 실패 {failed} / 건너뜀 {skipped} (총 {len(jobs)}개, {time.perf_counter() - start:.1f}s)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
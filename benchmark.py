@@ -0,0 +1,1048 @@
+"""렌더링 성능 벤치마크
+
+사용법:
+    python benchmark.py gradient [--repeat 5] [--parity]
+    python benchmark.py wrap [--repeat 5] [--parity]
+    python benchmark.py backgrounds [--cards 8] [--latency 0.5] [--workers 4]
+    python benchmark.py hedging [--cards 4] [--primary-latency 3] [--budget 0.5] [--checks-only]
+    python benchmark.py draft [--scale 0.25] [--repeat 3]
+    python benchmark.py effects [--repeat 3]
+    python benchmark.py layers [--repeat 3]
+    python benchmark.py layout [--repeat 3]
+    python benchmark.py preview [--repeat 3] [--cards 5]
+    python benchmark.py encode [--repeat 3]
+    python benchmark.py zipbuild [--cards 8] [--repeat 3]
+    python benchmark.py zip [--cards 8] [--size 2000]
+    python benchmark.py import [--repeat 5]
+    python benchmark.py suite [--stages ...] [--platforms ...] [--output results.json]
+                              [--baseline baseline.json] [--threshold 0.1] [--min-delta 0.5]
+    python benchmark.py compare baseline.json results.json [--threshold 0.1] [--min-delta 0.5]
+"""
+
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+
+import numpy as np
+
+from PIL import Image, ImageChops, ImageDraw, ImageEnhance, ImageFilter
+
+import cardnews
+from cardnews import (
+    PLATFORM_SIZES,
+    PROVIDER_BASE_URLS,
+    apply_image_effects,
+    create_advanced_gradient,
+    create_carousel_zip,
+    render_gradient_template,
+    fetch_card_backgrounds,
+    generate_ai_background_advanced,
+    get_draft_size,
+    get_korean_font,
+    get_optimized_font_sizes,
+    get_optimized_spacing,
+    get_preview_scale,
+    render_carousel_card,
+    split_content_into_cards,
+    wrap_text,
+)
+from encoders import ENCODER_PROFILES, PREVIEW_ENCODER, encode_image, get_platform_encoder
+from gradient import gradient_templates
+from image_cache import DiskImageCache
+from overlay import text_layers
+from stub_provider import StubImageServer
+from text_metrics import get_text_dimensions, text_metrics
+
+# 한글 본문 샘플 (길이별 벤치마크 입력 생성용)
+KOREAN_SAMPLE = (
+    "예식장 예약 시기별 할인율 비교 분석과 드레스 렌탈 대비 구매 비용 상세 계산법, "
+    "허니문 패키지 가격 협상 전략 및 신혼집 준비 우선순위 체크리스트를 정리했습니다. "
+)
+
+
+def legacy_putpixel_gradient(width, height, start_color, end_color):
+    """기존 픽셀 단위 그라데이션 (정합성 비교용 기준 구현)"""
+    img = Image.new('RGB', (width, height))
+
+    for y in range(height):
+        for x in range(width):
+            ratio = (y / height + x / width) / 2
+            ratio = ratio * ratio * (3.0 - 2.0 * ratio)
+
+            r = int(start_color[0] + (end_color[0] - start_color[0]) * ratio)
+            g = int(start_color[1] + (end_color[1] - start_color[1]) * ratio)
+            b = int(start_color[2] + (end_color[2] - start_color[2]) * ratio)
+
+            img.putpixel((x, y), (r, g, b))
+
+    return img
+
+
+def legacy_effects_chain(img, style, brightness=0.7):
+    """기존 ImageEnhance 연쇄 처리 + 카드 어둡게 처리 (비교용 기준 구현)"""
+    img = img.convert('RGB')
+
+    if style == "blur":
+        img = img.filter(ImageFilter.GaussianBlur(radius=12))
+    elif style == "dark":
+        img = ImageEnhance.Brightness(img).enhance(0.4)
+    elif style == "vintage":
+        img = ImageEnhance.Color(img).enhance(0.8)
+        img = ImageEnhance.Contrast(img).enhance(1.1)
+    elif style == "modern":
+        img = ImageEnhance.Contrast(img).enhance(1.2)
+        img = ImageEnhance.Sharpness(img).enhance(1.1)
+
+    img = img.convert('RGB')
+    return ImageEnhance.Brightness(img).enhance(brightness)
+
+
+def legacy_text_dimensions(text, font):
+    """기존 호출마다 임시 이미지를 만드는 텍스트 측정 (비교용 기준 구현)"""
+    temp_draw = ImageDraw.Draw(Image.new('RGB', (1, 1)))
+    bbox = temp_draw.textbbox((0, 0), text, font=font)
+    return bbox[2] - bbox[0], bbox[3] - bbox[1]
+
+
+def legacy_wrap_text(text, font, max_width):
+    """기존 글자마다 줄 전체를 다시 측정하는 줄바꿈 (정합성 비교용 기준 구현)"""
+    if not text:
+        return []
+
+    lines = []
+    current_line = ""
+
+    for char in text:
+        test_line = current_line + char
+        text_width, _ = legacy_text_dimensions(test_line, font)
+
+        if text_width <= max_width:
+            current_line = test_line
+        elif current_line:
+            lines.append(current_line)
+            current_line = char
+        else:
+            lines.append(char)
+            current_line = ""
+
+    if current_line:
+        lines.append(current_line)
+
+    return [line for line in lines if line.strip()]
+
+
+def korean_text(length):
+    """지정한 길이의 한글 본문 생성"""
+    repeated = KOREAN_SAMPLE * (length // len(KOREAN_SAMPLE) + 1)
+    return repeated[:length]
+
+
+def use_fresh_background_cache():
+    """빈 임시 디스크 캐시로 교체 (이전 실행의 다운로드가 측정에 섞이지 않도록)"""
+    cardnews.background_cache = DiskImageCache(tempfile.mkdtemp(prefix="cardnews-bench-"))
+
+
+def synthetic_photo(width, height):
+    """세부 묘사가 많은 사진 대용 이미지 (프랙탈 + 노이즈 + 그라데이션)"""
+    red = Image.effect_mandelbrot((width, height), (-2.0, -1.2, 0.8, 1.2), 100)
+    green = Image.effect_noise((width, height), 48)
+    blue = Image.radial_gradient('L').resize((width, height))
+    return Image.merge('RGB', (red, green, blue))
+
+
+def visual_difference(img_a, img_b):
+    """두 이미지의 평균 절대 오차(0~255)와 PSNR(dB)"""
+    a = np.asarray(img_a, dtype=np.float64)
+    b = np.asarray(img_b, dtype=np.float64)
+    mae = np.abs(a - b).mean()
+    mse = ((a - b) ** 2).mean()
+    psnr = float('inf') if mse == 0 else 10 * np.log10(255 ** 2 / mse)
+    return mae, psnr
+
+
+def max_channel_diff(img_a, img_b):
+    """두 이미지의 채널별 최대 차이"""
+    extrema = ImageChops.difference(img_a, img_b).getextrema()
+    return max(high for _, high in extrema)
+
+
+def time_call(func, repeat):
+    """func를 repeat번 실행한 뒤 최소 소요 시간(ms) 반환"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def bench_gradient(args):
+    """플랫폼 프리셋별 그라데이션 생성 시간 측정 (--parity: 허용 오차를 넘으면 종료 코드 1)"""
+    mismatches = 0
+    print(f"{'platform':<20} {'size':>11} {'ms/card':>9} {'cached ms':>10}" + (f" {'legacy ms':>10} {'max diff':>9}" if args.parity else ""))
+
+    for platform, (width, height, _) in PLATFORM_SIZES.items():
+        elapsed = time_call(lambda: render_gradient_template(width, height, "블루 그라데이션", 1), args.repeat)
+        cached = time_call(lambda: create_advanced_gradient(width, height, "블루 그라데이션", 1), args.repeat)
+        row = f"{platform:<20} {f'{width}x{height}':>11} {elapsed:>9.1f} {cached:>10.1f}"
+
+        if args.parity:
+            start_color, end_color = (30, 60, 114), (42, 82, 152)
+            start = time.perf_counter()
+            expected = legacy_putpixel_gradient(width, height, start_color, end_color)
+            legacy_ms = (time.perf_counter() - start) * 1000
+            diff = max_channel_diff(expected, create_advanced_gradient(width, height, "블루 그라데이션", 1))
+            row += f" {legacy_ms:>10.1f} {diff:>9}"
+            if diff > 1:
+                row += "  ❌ 허용 오차(±1) 초과"
+                mismatches += 1
+
+        print(row)
+
+    if mismatches:
+        sys.exit(1)
+
+
+def bench_wrap(args):
+    """본문 길이별 줄바꿈 시간 측정 (Custom Size 기준 내용 폰트, --parity: 기존 방식과 다르면 종료 코드 1)"""
+    width, height, _ = PLATFORM_SIZES["Custom Size"]
+    font = get_korean_font(get_optimized_font_sizes(width, height)['content'], 'regular')
+    max_width = width - get_optimized_spacing(width, height)['margin'] * 2
+
+    mismatches = 0
+    print(f"{'chars':>6} {'lines':>6} {'ms':>9}" + (f" {'legacy ms':>10} {'same':>5}" if args.parity else ""))
+
+    for length in (300, 1000, 3000):
+        text = korean_text(length)
+        elapsed = time_call(lambda: wrap_text(text, font, max_width), args.repeat)
+        lines = wrap_text(text, font, max_width)
+        row = f"{length:>6} {len(lines):>6} {elapsed:>9.2f}"
+
+        if args.parity:
+            start = time.perf_counter()
+            expected = legacy_wrap_text(text, font, max_width)
+            legacy_ms = (time.perf_counter() - start) * 1000
+            same = expected == lines
+            row += f" {legacy_ms:>10.2f} {'yes' if same else 'NO':>5}"
+            if not same:
+                row += "  ❌ 줄바꿈 위치 불일치"
+                mismatches += 1
+
+        print(row)
+
+    if mismatches:
+        sys.exit(1)
+
+
+def bench_backgrounds(args):
+    """스텁 API 서버(인위적 지연)로 카드 배경 순차/병렬 수집 시간 비교
+
+    병렬 결과가 순차 결과와 카드 순서가 다르거나, 한 카드만 실패시켰을 때 그 카드만
+    그라데이션으로 대체되지 않으면 종료 코드 1
+    """
+    width, height, _ = PLATFORM_SIZES["Instagram Carousel"]
+    cards = [{'title': f"카드 {i}", 'subtitle': '', 'content': KOREAN_SAMPLE} for i in range(1, args.cards + 1)]
+    failures = 0
+
+    with StubImageServer(latency=args.latency) as server:
+        PROVIDER_BASE_URLS.update(server.provider_urls())
+
+        expected = None
+        for workers in (1, args.workers):
+            use_fresh_background_cache()
+            start = time.perf_counter()
+            backgrounds = fetch_card_backgrounds(cards, "비즈니스", width, height, max_workers=workers)
+            elapsed = time.perf_counter() - start
+
+            # 순차 실행 결과와 카드별로 같은 이미지인지 비교
+            images = [img.tobytes() for img in backgrounds]
+            expected = expected or images
+            in_order = images == expected
+            print(f"workers={workers:<3} cards={len(cards):<3} {elapsed:>7.2f}s  in_order={in_order}"
+                  + ("" if in_order else "  ❌ 카드 순서 불일치"))
+            failures += not in_order
+
+        # 한 카드의 배경 API만 실패 → 그 카드만 그라데이션 대체, 나머지는 스텁 이미지 그대로
+        failing = (len(cards) + 1) // 2
+
+        def generate(keywords, card_number, *rest):
+            if card_number == failing:
+                raise RuntimeError("스텁 API 실패")
+            return cardnews.generate_keyword_background(keywords, card_number, *rest)
+
+        use_fresh_background_cache()
+        backgrounds = fetch_card_backgrounds(cards, "비즈니스", width, height, max_workers=args.workers, generate=generate)
+        fallback = create_advanced_gradient(width, height, "비즈니스", failing, darkening=cardnews.CARD_DARKENING)
+        fallback_ok = backgrounds[failing - 1].tobytes() == fallback.tobytes()
+        others_ok = all(
+            img.tobytes() == expected[index]
+            for index, img in enumerate(backgrounds) if index != failing - 1
+        )
+        print(f"{'✅' if fallback_ok else '❌'} 실패한 카드 {failing}만 그라데이션 대체")
+        print(f"{'✅' if others_ok else '❌'} 나머지 카드는 스텁 이미지를 원래 순서대로 유지")
+        failures += (not fallback_ok) + (not others_ok)
+
+    if failures:
+        sys.exit(1)
+
+
+class StubAttempt:
+    """race_providers용 가짜 API 시도 (지연 후 결과 반환·예외, 시작·취소 시각 기록)"""
+
+    def __init__(self, name, delay=0.0, result="ok", error=None):
+        self.name = name
+        self.delay = delay
+        self.result = result
+        self.error = error
+        self.started_at = None
+        self.cancelled = threading.Event()
+
+    def __call__(self, cancel):
+        self.started_at = time.monotonic()
+        if cancel.wait(self.delay):
+            self.cancelled.set()
+            return None
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def hedging_checks():
+    """race_providers 동작 확인 (스텁 시도) → [(검사 이름, 통과 여부, 설명)]"""
+    from hedging import race_providers
+
+    checks = []
+
+    def check(name, passed, detail=""):
+        checks.append((name, bool(passed), detail))
+
+    def race(stubs, budgets=None, deadline=None):
+        started = time.monotonic()
+        result = race_providers([(stub.name, stub) for stub in stubs], budgets, deadline)
+        return result, started, time.monotonic() - started
+
+    # 예산을 넘긴 1순위는 다음 API와 경쟁하고, 진 쪽은 취소 신호를 받음
+    slow, fast = StubAttempt("slow", delay=2.0), StubAttempt("fast", delay=0.02)
+    (name, result, _), started, elapsed = race([slow, fast], budgets={"slow": 0.1})
+    check("예산 초과 시 다음 API 추가 호출", name == "fast" and result == "ok", f"승자={name}")
+    hedge_delay = fast.started_at - started if fast.started_at is not None else None
+    check("예산(0.1s)이 지난 뒤에 추가 호출", hedge_delay is not None and 0.09 <= hedge_delay < 0.5,
+          "미호출" if hedge_delay is None else f"{hedge_delay:.3f}s")
+    check("진 시도에 취소 신호 전달", slow.cancelled.wait(1.0))
+    check("진 시도를 기다리지 않음", elapsed < 1.0, f"{elapsed:.2f}s")
+
+    # 예산 안에 응답하면 다음 API는 호출하지 않음
+    first, second = StubAttempt("first", delay=0.05), StubAttempt("second")
+    (name, _, _), _, _ = race([first, second], budgets={"first": 0.5})
+    check("예산 안의 응답은 다음 API 미호출", name == "first" and second.started_at is None, f"승자={name}")
+
+    # 예산이 없으면 순서대로 (앞 시도가 끝날 때까지 다음을 호출하지 않음)
+    first, second = StubAttempt("first", delay=0.15, result=None), StubAttempt("second")
+    (name, _, _), _, _ = race([first, second])
+    order_ok = second.started_at is not None and first.started_at is not None and second.started_at - first.started_at >= 0.14
+    check("예산 없음: 우선순위 순서대로 순차 실행", name == "second" and order_ok, f"승자={name}")
+
+    # 실패(예외·빈 응답)는 예산을 기다리지 않고 바로 다음 API로 넘어감
+    stubs = [
+        StubAttempt("error", error=RuntimeError("boom")),
+        StubAttempt("empty", result=None),
+        StubAttempt("last")
+    ]
+    (name, _, errors), _, elapsed = race(stubs, budgets={"error": 5.0, "empty": 5.0})
+    failed_names = [failed for failed, _ in errors]
+    check("실패 시 다음 API로 넘어감", name == "last" and failed_names == ["error", "empty"], f"승자={name}, 실패={failed_names}")
+    check("실패 후 예산을 기다리지 않음", elapsed < 1.0, f"{elapsed:.2f}s")
+
+    # 카드 전체 제한 시간이 지나면 경쟁 중단, 진행 중인 시도는 취소
+    hung = StubAttempt("hung", delay=5.0)
+    (name, result, errors), _, elapsed = race([hung], deadline=0.2)
+    check("제한 시간 초과 시 실패로 중단", name is None and result is None and errors and errors[-1][0] == "deadline", f"{elapsed:.2f}s")
+    check("제한 시간을 지킴", 0.19 <= elapsed < 0.6, f"{elapsed:.2f}s")
+    check("제한 시간 초과 시 취소 신호 전달", hung.cancelled.wait(1.0))
+
+    # 모두 실패하면 (None, None, 오류 목록)
+    (name, result, errors), _, _ = race([StubAttempt("a", result=None), StubAttempt("b", result=None)])
+    check("모두 실패 시 오류 목록 반환", name is None and result is None and len(errors) == 2)
+
+    # 실제 배경 생성이 설정된 API 순서를 따르는지 (스텁 서버, 헤징 끔)
+    saved = (dict(PROVIDER_BASE_URLS), cardnews.BACKGROUND_PROVIDER_ORDER, cardnews.BACKGROUND_HEDGING)
+    try:
+        with StubImageServer(status={"/unsplash": 503}) as server:
+            PROVIDER_BASE_URLS.update(server.provider_urls())
+            cardnews.BACKGROUND_PROVIDER_ORDER = ["unsplash_source", "lorem_picsum_varied", "pollinations"]
+            cardnews.BACKGROUND_HEDGING = False
+            use_fresh_background_cache()
+            generate_ai_background_advanced(KOREAN_SAMPLE, 1, "비즈니스", 320, 240, "blur")
+            hosts = [path.split('/')[1] for path in server.requests]
+        # 503은 재시도되므로 같은 API가 여러 번 나올 수 있음
+        visited = [host for index, host in enumerate(hosts) if index == 0 or hosts[index - 1] != host]
+        check("설정된 순서대로 호출, 실패 시 다음 API", visited == ["unsplash", "picsum"], f"{visited}")
+    finally:
+        PROVIDER_BASE_URLS.clear()
+        PROVIDER_BASE_URLS.update(saved[0])
+        cardnews.BACKGROUND_PROVIDER_ORDER, cardnews.BACKGROUND_HEDGING = saved[1], saved[2]
+
+    return checks
+
+
+def bench_hedging(args):
+    """race_providers 동작 확인(실패하면 종료 코드 1) 후, 느린 1순위 API(스텁)에서 순차/헤징 모드의 카드당 배경 생성 시간 비교"""
+    checks = hedging_checks()
+    for name, passed, detail in checks:
+        print(f"{'✅' if passed else '❌'} {name}" + (f" ({detail})" if detail else ""))
+    failed = sum(not passed for _, passed, _ in checks)
+    if failed:
+        print(f"❌ 헤징 동작 검사 {failed}개 실패")
+        sys.exit(1)
+    if args.checks_only:
+        return
+    print()
+
+    width, height, _ = PLATFORM_SIZES["Naver Blog"]
+
+    # pollinations만 느리고 나머지는 빠른 상황
+    with StubImageServer(latency={"/prompt/": args.primary_latency, "/": 0.05}) as server:
+        PROVIDER_BASE_URLS.update(server.provider_urls())
+        cardnews.BACKGROUND_HEDGE_BUDGETS = {name: args.budget for name in cardnews.BACKGROUND_HEDGE_BUDGETS}
+
+        for hedging in (False, True):
+            cardnews.BACKGROUND_HEDGING = hedging
+            use_fresh_background_cache()
+            timings = []
+            for card_number in range(1, args.cards + 1):
+                start = time.perf_counter()
+                generate_ai_background_advanced(KOREAN_SAMPLE, card_number, "비즈니스", width, height, "blur")
+                timings.append(time.perf_counter() - start)
+            timings.sort()
+            print(f"hedging={str(hedging):<5} p50={timings[len(timings) // 2]:.2f}s max={timings[-1]:.2f}s")
+
+
+def bench_draft(args):
+    """블러 배경: 원본 해상도 경로와 축소 해상도(draft) 경로의 용량·시간·화질 비교"""
+    print(f"{'platform':<20} {'path':<6} {'KB':>8} {'decode ms':>10} {'blur ms':>9} {'total ms':>9} {'MAE':>6} {'PSNR':>7}")
+
+    for platform, (width, height, _) in PLATFORM_SIZES.items():
+        source = synthetic_photo(width, height)
+        draft_size = get_draft_size(width, height, args.scale)
+
+        # API가 보내주는 JPEG 응답 흉내 (draft는 API에 작은 크기를 요청한 경우)
+        payloads = {}
+        for path, size in (("full", (width, height)), ("draft", draft_size)):
+            buffer = io.BytesIO()
+            source.resize(size, Image.Resampling.LANCZOS).save(buffer, format='JPEG', quality=90)
+            payloads[path] = buffer.getvalue()
+
+        results = {}
+        for path, payload in payloads.items():
+            def decode():
+                img = Image.open(io.BytesIO(payload))
+                img.load()
+                return img
+
+            decoded = decode()
+            blurred = apply_image_effects(decoded, "blur", decoded.width / width, brightness=cardnews.CARD_DARKENING)
+
+            decode_ms = time_call(decode, args.repeat)
+            blur_ms = time_call(lambda: apply_image_effects(decoded, "blur", decoded.width / width, brightness=cardnews.CARD_DARKENING), args.repeat)
+            upscale_ms = 0.0
+            if blurred.size != (width, height):
+                upscale_ms = time_call(lambda: blurred.resize((width, height), Image.Resampling.BICUBIC), args.repeat)
+                blurred = blurred.resize((width, height), Image.Resampling.BICUBIC)
+            results[path] = (len(payload), decode_ms, blur_ms + upscale_ms, blurred)
+
+        for path, (size_bytes, decode_ms, blur_ms, img) in results.items():
+            mae, psnr = visual_difference(results["full"][3], img)
+            print(f"{platform:<20} {path:<6} {size_bytes / 1024:>8.1f} {decode_ms:>10.1f} {blur_ms:>9.1f} "
+                  f"{decode_ms + blur_ms:>9.1f} {mae:>6.2f} {psnr:>7.1f}")
+
+
+# 합친 후처리 파이프라인이 기존 연쇄와 달라도 되는 채널별 최대 차이 (반올림 순서 차이)
+EFFECTS_TOLERANCE = 1
+
+
+def bench_effects(args):
+    """스타일별 후처리: 기존 ImageEnhance 연쇄와 합친 파이프라인의 시간·픽셀 차이 비교 (허용 오차를 넘으면 종료 코드 1)"""
+    width, height, _ = PLATFORM_SIZES["Custom Size"]
+    source = synthetic_photo(width, height)
+    mismatches = 0
+
+    print(f"{'style':<8} {'legacy ms':>10} {'fused ms':>9} {'max diff':>9}")
+    for style in ("blur", "dark", "vintage", "modern"):
+        legacy_ms = time_call(lambda: legacy_effects_chain(source, style, cardnews.CARD_DARKENING), args.repeat)
+        fused_ms = time_call(lambda: apply_image_effects(source, style, brightness=cardnews.CARD_DARKENING), args.repeat)
+        diff = max_channel_diff(legacy_effects_chain(source, style, cardnews.CARD_DARKENING), apply_image_effects(source, style, brightness=cardnews.CARD_DARKENING))
+        row = f"{style:<8} {legacy_ms:>10.1f} {fused_ms:>9.1f} {diff:>9}"
+        if diff > EFFECTS_TOLERANCE:
+            row += f"  ❌ 허용 오차(±{EFFECTS_TOLERANCE}) 초과"
+            mismatches += 1
+        print(row)
+
+    if mismatches:
+        sys.exit(1)
+
+
+def bench_layers(args):
+    """테마만 바꿔 다시 그릴 때: 텍스트 레이어를 새로 그리는 경우 vs 캐시된 레이어를 합성만 하는 경우"""
+    cards_data = split_content_into_cards("레이어 합성 측정", "테마 변경", korean_text(300), 2)
+    card = cards_data[1]
+
+    print(f"{'platform':<20} {'cold ms':>8} {'warm ms':>8} {'layer KB':>9}")
+    for platform, (width, height, _) in PLATFORM_SIZES.items():
+        def render():
+            return cardnews.create_carousel_card(card, 2, len(cards_data), "gradient", "비즈니스", width, height)
+
+        def cold():
+            text_layers.clear()
+            return render()
+
+        render()
+        cold_ms = time_call(cold, args.repeat)
+        render()
+        warm_ms = time_call(render, args.repeat)
+        layer = cardnews.get_text_layer(card, 2, len(cards_data), width, height)
+        print(f"{platform:<20} {cold_ms:>8.1f} {warm_ms:>8.1f} {text_layers.image_bytes(layer) / 1024:>9.1f}")
+
+
+def bench_layout(args):
+    """본문 길이별 맞춤 레이아웃: 선택된 폰트 크기·시도 횟수·계획 시간 (cold: 단락 줄바꿈 캐시를 비운 상태)"""
+    from layout_solver import wrapped_paragraphs
+
+    print(f"{'platform':<20} {'chars':>6} {'size':>5} {'tries':>6} {'fits':>5} {'cold ms':>8} {'warm ms':>8}")
+    for platform, (width, height, _) in PLATFORM_SIZES.items():
+        for length in (200, 800, 2400):
+            content = "\n".join("• " + korean_text(length // 8) for _ in range(8))
+            card = {'title': "맞춤 레이아웃 측정", 'subtitle': "본문 길이별", 'content': content}
+
+            def cold():
+                wrapped_paragraphs.clear()
+                return cardnews.plan_card_layout(card, 2, 3, width, height)
+
+            cold_ms = time_call(cold, args.repeat)
+            warm_ms = time_call(lambda: cardnews.plan_card_layout(card, 2, 3, width, height), args.repeat)
+            plan = cardnews.plan_card_layout(card, 2, 3, width, height)
+            print(f"{platform:<20} {length:>6} {plan['content_size']:>5} {plan['content_attempts']:>6} "
+                  f"{str(plan['content_fits']):>5} {cold_ms:>8.1f} {warm_ms:>8.1f}")
+
+
+def bench_preview(args):
+    """본문을 고칠 때마다 캐러셀 전체를 다시 그리는 비용: 원본 크기 vs 미리보기 축소판 (텍스트 레이어 캐시를 비운 상태)"""
+    from layout_solver import wrapped_paragraphs
+
+    content = "\n".join("• " + korean_text(60) for _ in range(12))
+    cards_data = split_content_into_cards("미리보기 측정", "본문 수정 반복", content, args.cards)
+    total = len(cards_data)
+
+    print(f"{'platform':<20} {'scale':>6} {'full ms':>8} {'preview ms':>11} {'full KB':>8} {'preview KB':>11}")
+    for platform, (width, height, _) in PLATFORM_SIZES.items():
+        scale = get_preview_scale(width, height)
+        encoder = get_platform_encoder(platform)
+
+        def carousel(card_encoder, card_scale):
+            text_layers.clear()
+            wrapped_paragraphs.clear()
+            return [
+                render_carousel_card(card, number, total, "gradient", "비즈니스", width, height,
+                                     encoder=card_encoder, scale=card_scale)
+                for number, card in enumerate(cards_data, 1)
+            ]
+
+        full = carousel(encoder, 1.0)
+        preview = carousel(PREVIEW_ENCODER, scale)
+        full_ms = time_call(lambda: carousel(encoder, 1.0), args.repeat)
+        preview_ms = time_call(lambda: carousel(PREVIEW_ENCODER, scale), args.repeat)
+        full_kb = sum(rendered['encoding']['bytes'] for rendered in full) / 1024
+        preview_kb = sum(rendered['encoding']['bytes'] for rendered in preview) / 1024
+        print(f"{platform:<20} {scale:>6.2f} {full_ms:>8.1f} {preview_ms:>11.1f} {full_kb:>8.0f} {preview_kb:>11.0f}")
+
+
+def bench_encode(args):
+    """인코더 프로필별 카드 인코딩 시간·크기 (사진 배경 카드, 플랫폼별)"""
+    title = "인코딩 측정"
+    cards_data = split_content_into_cards(title, "프로필 비교", korean_text(300), 2)
+
+    print(f"{'platform':<20} {'profile':<14} {'ms':>8} {'KB':>9}  (기본 프로필 *)")
+    for platform, (width, height, _) in PLATFORM_SIZES.items():
+        card = cardnews.create_carousel_card(
+            cards_data[1], 2, len(cards_data), "ai", "비즈니스", width, height, synthetic_photo(width, height)
+        )
+        default = get_platform_encoder(platform)
+
+        # 기존 저장 방식 (quality=100은 PNG에 효과 없음, optimize=True로 다중 패스 압축)
+        def legacy_encode():
+            buffer = io.BytesIO()
+            card.save(buffer, format='PNG', quality=100, optimize=True)
+            return buffer.getvalue()
+
+        legacy_ms = time_call(legacy_encode, args.repeat)
+        print(f"{platform:<20} {'legacy':<14} {legacy_ms:>8.1f} {len(legacy_encode()) / 1024:>9.1f}")
+
+        for profile in ENCODER_PROFILES:
+            ms = time_call(lambda: encode_image(card, profile), args.repeat)
+            encoding = encode_image(card, profile)[1]
+            marker = (" *" if profile == default else "") + (f"  ⚠️ {encoding['fallback']} 대체" if encoding['fallback'] else "")
+            print(f"{platform:<20} {profile:<14} {ms:>8.1f} {encoding['bytes'] / 1024:>9.1f}{marker}")
+
+
+def bench_zipbuild(args):
+    """ZIP 만들기: 기존(모든 항목 DEFLATED + getvalue) vs 형식별 압축(이미지 STORED)"""
+    width, height, _ = PLATFORM_SIZES["Instagram Carousel"]
+    content = "\n".join(korean_text(200) for _ in range(args.cards - 1))
+    cards_data = split_content_into_cards("ZIP 측정", "압축 비교", content, args.cards)
+    photo = synthetic_photo(width, height)
+
+    print(f"{'encoder':<14} {'legacy ms':>10} {'legacy KB':>10} {'stored ms':>10} {'stored KB':>10}")
+    for encoder in ("fast_png", "archival_png", "webp", "jpeg"):
+        rendered_cards = [
+            render_carousel_card(card_data, i, len(cards_data), "ai", "비즈니스", width, height, photo.copy(), encoder)
+            for i, card_data in enumerate(cards_data, 1)
+        ]
+
+        def legacy_zip():
+            zip_buffer = io.BytesIO()
+            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+                for rendered in rendered_cards:
+                    zip_file.writestr(rendered['filename'], rendered['image_bytes'])
+            return len(zip_buffer.getvalue())
+
+        def stored_zip():
+            return create_carousel_zip(rendered_cards).size
+
+        legacy_ms = time_call(legacy_zip, args.repeat)
+        stored_ms = time_call(stored_zip, args.repeat)
+        print(f"{encoder:<14} {legacy_ms:>10.1f} {legacy_zip() / 1024:>10.1f} {stored_ms:>10.1f} {stored_zip() / 1024:>10.1f}")
+
+
+def zip_rss_run(mode, cards, size):
+    """한 가지 ZIP 방식으로 캐러셀을 만든 뒤 (최대 RSS MB, 렌더링 전 RSS MB, 파이썬 버퍼 최대 MB, ZIP 크기) 출력 (하위 프로세스용)"""
+    import resource
+    import tracemalloc
+    from archive import CarouselArchive
+
+    title = "메모리 측정"
+    content = "\n".join(korean_text(200) for _ in range(cards - 1))
+    cards_data = split_content_into_cards(title, "ZIP", content, cards)
+    # 사진 배경 카드 (그라데이션 카드는 PNG가 수 KB라 차이가 드러나지 않음)
+    photo = synthetic_photo(size, size)
+    # 폰트 로드·첫 렌더링은 측정에서 제외
+    render_carousel_card(cards_data[0], 1, len(cards_data), "ai", "비즈니스", size, size, photo.copy())
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    # PNG·ZIP 바이트는 파이썬 할당이므로 tracemalloc으로 따로 측정 (RSS는 이미지 처리 순간값이 지배)
+    tracemalloc.start()
+
+    rendered_cards = (
+        render_carousel_card(card_data, i, len(cards_data), "ai", "비즈니스", size, size, photo.copy())
+        for i, card_data in enumerate(cards_data, 1)
+    )
+    if mode == "legacy":
+        # 기존 방식: 카드를 모두 모은 뒤 BytesIO ZIP, 다운로드 버튼·용량 표시에서 getvalue() 두 번
+        generated = list(rendered_cards)
+        zip_buffer = io.BytesIO()
+        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+            for rendered in generated:
+                zip_file.writestr(rendered['filename'], rendered['image_bytes'])
+        download = zip_buffer.getvalue()
+        zip_size = len(zip_buffer.getvalue())
+    else:
+        # 스트리밍: 카드마다 바로 ZIP에 기록, 결과는 핸들 하나로 한 번만 읽음
+        archive = CarouselArchive(spool_bytes=0 if mode == "spill" else None)
+        for rendered in rendered_cards:
+            archive.add(rendered)
+        download = archive.open().read()
+        zip_size = archive.size
+
+    buffers_peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{peak:.1f} {baseline:.1f} {buffers_peak:.1f} {zip_size} {len(cards_data)}")
+
+
+def bench_zip(args):
+    """ZIP 생성 방식별 최대 RSS (방식마다 새 프로세스, 카드 PNG 생성 포함)"""
+    if args.mode:
+        zip_rss_run(args.mode, args.cards, args.size)
+        return
+
+    for mode in ("legacy", "streaming", "spill"):
+        output = subprocess.run(
+            [sys.executable, __file__, "zip", "--mode", mode, "--cards", str(args.cards), "--size", str(args.size)],
+            capture_output=True, text=True, check=True
+        ).stdout.split()
+        peak, baseline, buffers_peak, zip_size = float(output[0]), float(output[1]), float(output[2]), int(output[3])
+        if mode == "legacy":
+            print(f"cards={output[4]} size={args.size}x{args.size}")
+            print(f"{'mode':<10} {'peak RSS MB':>12} {'before MB':>10} {'buffers MB':>11} {'zip KB':>8}")
+        print(f"{mode:<10} {peak:>12.1f} {baseline:>10.1f} {buffers_peak:>11.1f} {zip_size / 1024:>8.1f}")
+
+
+IMPORT_CHECK = """
+import sys, time
+start = time.perf_counter()
+import cardnews
+elapsed = (time.perf_counter() - start) * 1000
+heavy = [name for name in ("streamlit", "numpy", "requests") if name in sys.modules]
+print(f"{elapsed:.1f} {','.join(heavy) or '-'}")
+"""
+
+
+def bench_import(args):
+    """코어 모듈(cardnews) 임포트 시간과 함께 불러온 무거운 모듈 (매번 새 프로세스)"""
+    timings = []
+    for _ in range(args.repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", IMPORT_CHECK], capture_output=True, text=True, check=True
+        ).stdout.split()
+        timings.append(float(output[0]))
+        heavy = output[1]
+
+    print(f"import cardnews: best {min(timings):.1f} ms / median {sorted(timings)[len(timings) // 2]:.1f} ms")
+    print(f"함께 불러온 무거운 모듈: {heavy}")
+    if "streamlit" in heavy.split(","):
+        raise SystemExit("렌더링 코어가 streamlit을 임포트합니다")
+
+
+# 측정 모음(suite) 본문 길이 (짧은/중간/긴 한글 본문 글자 수)
+SUITE_CONTENT_LENGTHS = {
+    "short": 80,
+    "medium": 400,
+    "long": 1500
+}
+
+SUITE_STAGES = ("gradient", "wrap", "text_dimensions", "effects", "card", "card_ai", "split", "zip")
+
+# 결과 파일 형식이 바뀌면 올림 (compare는 같은 버전끼리만 비교)
+SUITE_FORMAT_VERSION = 1
+
+
+def time_stage(func, repeat, setup=None):
+    """func를 repeat번 실행해 최소·중앙값(ms) 반환 (setup은 매번 측정 전에 실행, 시간에 포함하지 않음)"""
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {'min_ms': timings[0], 'median_ms': timings[len(timings) // 2]}
+
+
+def suite_environment():
+    """측정 환경 (기준선과 다른 환경에서 비교하면 compare가 경고)"""
+    import platform
+    import PIL
+
+    return {
+        'python': platform.python_version(),
+        'pillow': PIL.__version__,
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'system': platform.system(),
+        'cpus': os.cpu_count()
+    }
+
+
+def clear_render_caches():
+    """렌더링 결과 캐시 비우기 (폰트·글자 폭 측정 캐시는 유지해 정상 상태의 실제 작업량만 측정)"""
+    from layout_solver import wrapped_paragraphs
+
+    gradient_templates.clear()
+    text_layers.clear()
+    wrapped_paragraphs.clear()
+
+
+def suite_cases(stages, platforms):
+    """(결과 키, 측정 함수, 준비 함수) 목록
+
+    결과 키: "단계/플랫폼/본문 길이" (플랫폼·본문과 무관한 단계는 "-")
+    """
+    cases = []
+    stage_set = set(stages)
+
+    if "split" in stage_set:
+        for length_name, length in SUITE_CONTENT_LENGTHS.items():
+            content = korean_text(length)
+            cases.append((
+                f"split/-/{length_name}",
+                lambda content=content: split_content_into_cards("측정 모음", "카드 분할", content),
+                None
+            ))
+
+    for platform in platforms:
+        width, height, _ = PLATFORM_SIZES[platform]
+
+        if "gradient" in stage_set:
+            cases.append((
+                f"gradient/{platform}/-",
+                lambda width=width, height=height: create_advanced_gradient(width, height, "비즈니스", 1, darkening=cardnews.CARD_DARKENING),
+                gradient_templates.clear
+            ))
+
+        if "effects" in stage_set:
+            photo = synthetic_photo(width, height)
+            for style in ("blur", "dark", "vintage", "modern"):
+                cases.append((
+                    f"effects.{style}/{platform}/-",
+                    lambda photo=photo, style=style: apply_image_effects(photo, style, brightness=cardnews.CARD_DARKENING),
+                    None
+                ))
+
+        font_sizes = get_optimized_font_sizes(width, height)
+        spacing = get_optimized_spacing(width, height)
+        content_font = get_korean_font(font_sizes['content'])
+        max_width = width - spacing['margin'] * 2
+
+        for length_name, length in SUITE_CONTENT_LENGTHS.items():
+            content = korean_text(length)
+            key = f"{platform}/{length_name}"
+
+            if "wrap" in stage_set:
+                cases.append((
+                    f"wrap/{key}",
+                    lambda content=content, max_width=max_width: wrap_text(content, content_font, max_width),
+                    None
+                ))
+
+            if "text_dimensions" in stage_set:
+                lines = wrap_text(content, content_font, max_width)
+                cases.append((
+                    f"text_dimensions/{key}",
+                    lambda lines=lines: [get_text_dimensions(line, content_font) for line in lines],
+                    text_metrics.clear
+                ))
+
+            cards_data = split_content_into_cards("측정 모음", "단계별 성능", content)
+            card = cards_data[1] if len(cards_data) > 1 else cards_data[0]
+            total = len(cards_data)
+
+            if "card" in stage_set:
+                cases.append((
+                    f"card/{key}",
+                    lambda card=card, total=total, width=width, height=height: cardnews.create_carousel_card(
+                        card, 2, total, "gradient", "비즈니스", width, height
+                    ),
+                    clear_render_caches
+                ))
+
+            if "card_ai" in stage_set:
+                # 배경 API는 로컬 스텁 서버, 디스크 캐시는 매번 새로 (다운로드·디코딩·후처리 포함)
+                def fresh_ai_caches():
+                    clear_render_caches()
+                    use_fresh_background_cache()
+
+                cases.append((
+                    f"card_ai/{key}",
+                    lambda card=card, total=total, width=width, height=height: cardnews.create_carousel_card(
+                        card, 2, total, "ai", "비즈니스", width, height
+                    ),
+                    fresh_ai_caches
+                ))
+
+            if "zip" in stage_set:
+                rendered_cards = [
+                    render_carousel_card(card_data, number, total, "gradient", "비즈니스", width, height)
+                    for number, card_data in enumerate(cards_data, 1)
+                ]
+                cases.append((
+                    f"zip/{key}",
+                    lambda rendered_cards=rendered_cards: create_carousel_zip(rendered_cards).discard(),
+                    None
+                ))
+
+    return cases
+
+
+def run_suite(stages, platforms, repeat):
+    """측정 모음 실행 → 결과 딕셔너리 (JSON 기준선 형식)"""
+    results = {}
+    with StubImageServer() as server:
+        PROVIDER_BASE_URLS.update(server.provider_urls())
+        use_fresh_background_cache()
+
+        for key, func, setup in suite_cases(stages, platforms):
+            # 첫 실행(폰트 로드·numpy 임포트 등)은 버림
+            if setup:
+                setup()
+            func()
+            results[key] = time_stage(func, repeat, setup)
+            print(f"{key:<52} {results[key]['min_ms']:>9.2f} ms  (median {results[key]['median_ms']:.2f})")
+
+    return {
+        'version': SUITE_FORMAT_VERSION,
+        'created': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        'repeat': repeat,
+        'environment': suite_environment(),
+        'results': results
+    }
+
+
+def compare_results(baseline, current, threshold, min_delta_ms):
+    """기준선 대비 변화 출력 후 회귀한 항목 목록 반환
+
+    회귀: 최소 시간이 threshold(비율) 넘게 늘고, 늘어난 시간이 min_delta_ms 이상 (짧은 단계의 측정 잡음 제외)
+    """
+    if baseline.get('version') != current.get('version'):
+        raise ValueError(f"결과 형식 버전이 다릅니다 (기준선 {baseline.get('version')}, 현재 {current.get('version')})")
+    if baseline.get('environment') != current.get('environment'):
+        print("⚠️ 측정 환경이 기준선과 다릅니다 (결과 해석에 주의)")
+        for name, value in current.get('environment', {}).items():
+            base_value = baseline.get('environment', {}).get(name)
+            if base_value != value:
+                print(f"   {name}: {base_value} → {value}")
+
+    regressions = []
+    print(f"{'case':<52} {'base ms':>9} {'now ms':>9} {'change':>8}")
+    for key, result in current['results'].items():
+        base = baseline['results'].get(key)
+        if base is None:
+            print(f"{key:<52} {'-':>9} {result['min_ms']:>9.2f} {'new':>8}")
+            continue
+
+        base_ms, now_ms = base['min_ms'], result['min_ms']
+        change = (now_ms - base_ms) / base_ms if base_ms else 0.0
+        marker = ""
+        if change > threshold and now_ms - base_ms >= min_delta_ms:
+            regressions.append(key)
+            marker = "  ❌ 회귀"
+        elif change < -threshold and base_ms - now_ms >= min_delta_ms:
+            marker = "  ✅ 개선"
+        print(f"{key:<52} {base_ms:>9.2f} {now_ms:>9.2f} {change:>+7.1%}{marker}")
+
+    for key in baseline['results']:
+        if key not in current['results']:
+            print(f"{key:<52} {baseline['results'][key]['min_ms']:>9.2f} {'-':>9} {'missing':>8}")
+
+    print(f"\n회귀 {len(regressions)}건 (기준: +{threshold:.0%} 그리고 +{min_delta_ms} ms 이상)")
+    return regressions
+
+
+def load_results(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def bench_suite(args):
+    """모든 렌더링 단계 × 플랫폼 프리셋 × 본문 길이 측정, JSON 저장·기준선 비교"""
+    stages = args.stages or list(SUITE_STAGES)
+    platforms = args.platforms or list(PLATFORM_SIZES)
+    for platform in platforms:
+        if platform not in PLATFORM_SIZES:
+            raise SystemExit(f"알 수 없는 플랫폼 '{platform}' (사용 가능: {', '.join(PLATFORM_SIZES)})")
+
+    current = run_suite(stages, platforms, args.repeat)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(current, f, ensure_ascii=False, indent=2)
+        print(f"\n결과 저장: {args.output}")
+
+    if args.baseline:
+        print()
+        regressions = compare_results(load_results(args.baseline), current, args.threshold, args.min_delta)
+        if regressions:
+            sys.exit(1)
+
+
+def bench_compare(args):
+    """저장된 두 결과 파일 비교 (회귀가 있으면 종료 코드 1)"""
+    regressions = compare_results(load_results(args.baseline), load_results(args.current), args.threshold, args.min_delta)
+    if regressions:
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="카드뉴스 렌더링 벤치마크")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    gradient_parser = subparsers.add_parser("gradient", help="그라데이션 배경 생성")
+    gradient_parser.add_argument("--repeat", type=int, default=5)
+    gradient_parser.add_argument("--parity", action="store_true", help="기존 putpixel 구현과 픽셀 비교")
+    gradient_parser.set_defaults(func=bench_gradient)
+
+    wrap_parser = subparsers.add_parser("wrap", help="한글 본문 줄바꿈 (300/1000/3000자)")
+    wrap_parser.add_argument("--repeat", type=int, default=5)
+    wrap_parser.add_argument("--parity", action="store_true", help="기존 줄바꿈 구현과 결과 비교")
+    wrap_parser.set_defaults(func=bench_wrap)
+
+    backgrounds_parser = subparsers.add_parser("backgrounds", help="카드 배경 병렬 수집 (로컬 스텁 서버)")
+    backgrounds_parser.add_argument("--cards", type=int, default=8)
+    backgrounds_parser.add_argument("--latency", type=float, default=0.5, help="스텁 서버 응답 지연(초)")
+    backgrounds_parser.add_argument("--workers", type=int, default=4)
+    backgrounds_parser.set_defaults(func=bench_backgrounds)
+
+    hedging_parser = subparsers.add_parser("hedging", help="배경 API 헤징 (느린 1순위 API 스텁)")
+    hedging_parser.add_argument("--cards", type=int, default=4)
+    hedging_parser.add_argument("--primary-latency", type=float, default=3.0, help="1순위 API 응답 지연(초)")
+    hedging_parser.add_argument("--budget", type=float, default=0.5, help="다음 API를 추가 호출하기 전 대기(초)")
+    hedging_parser.add_argument("--checks-only", action="store_true", help="동작 검사만 실행 (시간 측정 생략)")
+    hedging_parser.set_defaults(func=bench_hedging)
+
+    draft_parser = subparsers.add_parser("draft", help="블러 배경 원본/축소 해상도 경로 비교")
+    draft_parser.add_argument("--scale", type=float, default=0.25)
+    draft_parser.add_argument("--repeat", type=int, default=3)
+    draft_parser.set_defaults(func=bench_draft)
+
+    effects_parser = subparsers.add_parser("effects", help="스타일 후처리 (기존 연쇄 vs 합친 파이프라인)")
+    effects_parser.add_argument("--repeat", type=int, default=3)
+    effects_parser.set_defaults(func=bench_effects)
+
+    layers_parser = subparsers.add_parser("layers", help="텍스트 레이어 캐시 (새로 그리기 vs 합성만)")
+    layers_parser.add_argument("--repeat", type=int, default=3)
+    layers_parser.set_defaults(func=bench_layers)
+
+    layout_parser = subparsers.add_parser("layout", help="본문 길이별 맞춤 레이아웃 (폰트 크기 이진 탐색)")
+    layout_parser.add_argument("--repeat", type=int, default=3)
+    layout_parser.set_defaults(func=bench_layout)
+
+    preview_parser = subparsers.add_parser("preview", help="캐러셀 전체 다시 그리기 (원본 크기 vs 미리보기 축소판)")
+    preview_parser.add_argument("--repeat", type=int, default=3)
+    preview_parser.add_argument("--cards", type=int, default=5)
+    preview_parser.set_defaults(func=bench_preview)
+
+    encode_parser = subparsers.add_parser("encode", help="인코더 프로필별 인코딩 시간·크기")
+    encode_parser.add_argument("--repeat", type=int, default=3)
+    encode_parser.set_defaults(func=bench_encode)
+
+    zipbuild_parser = subparsers.add_parser("zipbuild", help="ZIP 만들기 시간·크기 (이미지 재압축 vs STORED)")
+    zipbuild_parser.add_argument("--cards", type=int, default=8)
+    zipbuild_parser.add_argument("--repeat", type=int, default=3)
+    zipbuild_parser.set_defaults(func=bench_zipbuild)
+
+    zip_parser = subparsers.add_parser("zip", help="ZIP 생성 방식별 최대 RSS (기존 BytesIO vs 스트리밍)")
+    zip_parser.add_argument("--cards", type=int, default=8)
+    zip_parser.add_argument("--size", type=int, default=2000, help="정사각형 카드 한 변 픽셀")
+    zip_parser.add_argument("--mode", choices=("legacy", "streaming", "spill"), help="한 방식만 실행 (내부용)")
+    zip_parser.set_defaults(func=bench_zip)
+
+    suite_parser = subparsers.add_parser("suite", help="전체 단계 × 플랫폼 × 본문 길이 측정 (JSON 저장, 기준선 비교)")
+    suite_parser.add_argument("--repeat", type=int, default=3)
+    suite_parser.add_argument("--stages", nargs="+", choices=SUITE_STAGES, help="측정할 단계 (기본: 전체)")
+    suite_parser.add_argument("--platforms", nargs="+", help="측정할 플랫폼 프리셋 (기본: 전체)")
+    suite_parser.add_argument("--output", help="결과 JSON 저장 경로")
+    suite_parser.add_argument("--baseline", help="비교할 기준선 JSON (회귀가 있으면 종료 코드 1)")
+    suite_parser.add_argument("--threshold", type=float, default=0.10, help="회귀로 볼 증가 비율")
+    suite_parser.add_argument("--min-delta", type=float, default=0.5, help="회귀로 볼 최소 증가량(ms)")
+    suite_parser.set_defaults(func=bench_suite)
+
+    compare_parser = subparsers.add_parser("compare", help="저장된 결과 JSON 두 개 비교")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="회귀로 볼 증가 비율")
+    compare_parser.add_argument("--min-delta", type=float, default=0.5, help="회귀로 볼 최소 증가량(ms)")
+    compare_parser.set_defaults(func=bench_compare)
+
+    import_parser = subparsers.add_parser("import", help="코어 모듈 임포트 시간 (streamlit 비의존 확인)")
+    import_parser.add_argument("--repeat", type=int, default=5)
+    import_parser.set_defaults(func=bench_import)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1159 @@
+"""카드뉴스 렌더링 코어 (Streamlit 없이 임포트 가능)
+
+배치 CLI·작업 프로세스에서도 쓰이므로 여기서는 streamlit을 임포트하지 않는다.
+경고/진행 메시지는 reporting의 Reporter로 보내고(기본은 무시), 화면 표시는 각 소비자(app.py 등)가 맡는다.
+"""
+
+from PIL import Image, ImageDraw, ImageFont
+import io
+import os
+from pathlib import Path
+import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from archive import CarouselArchive
+from encoders import DEFAULT_ENCODER, encode_image
+from font_registry import font_registry
+from gradient import gradient_templates, render_diagonal_gradient
+from hedging import race_providers
+from http_client import RequestCancelled, fetch_bytes
+from image_cache import background_cache, content_key
+from layout_solver import fit_text_block
+from overlay import composite_text_layer, crop_layer, text_layers
+from postprocess import apply_fused_effects, darken_image
+from reporting import get_reporter
+from text_layout import wrap_text
+from text_metrics import get_text_dimensions
+from tracing import capture_trace, span, use_trace
+
+# 플랫폼별 사이즈 정의
+PLATFORM_SIZES = {
+    "Instagram Carousel": (1080, 1080, "정사각형 - Instagram 캐러셀 최적화"),
+    "YouTube Thumbnail": (1280, 720, "16:9 - YouTube 썸네일 표준"),
+    "Naver Blog": (800, 600, "4:3 - 네이버 블로그 썸네일"),
+    "Facebook Post": (1200, 630, "1.91:1 - Facebook 링크 미리보기"),
+    "Custom Size": (1080, 1920, "사용자 정의")
+}
+
+# 테마별 그라데이션 색상 조합
+GRADIENT_THEME_COLORS = {
+    "비즈니스": [
+        [(30, 60, 114), (42, 82, 152)],
+        [(67, 56, 202), (147, 51, 234)],
+        [(30, 58, 138), (59, 130, 246)]
+    ],
+    "자연": [
+        [(34, 197, 94), (22, 163, 74)],
+        [(16, 185, 129), (5, 150, 105)],
+        [(101, 163, 13), (77, 124, 15)]
+    ],
+    "기술": [
+        [(30, 41, 59), (55, 65, 81)],
+        [(15, 23, 42), (30, 41, 59)],
+        [(51, 65, 85), (71, 85, 105)]
+    ],
+    "블루 그라데이션": [
+        [(52, 73, 219), (73, 150, 219)],
+        [(30, 60, 114), (42, 82, 152)],
+        [(67, 56, 202), (147, 51, 234)]
+    ],
+    "퍼플 그라데이션": [
+        [(106, 90, 205), (147, 51, 234)],
+        [(67, 56, 202), (147, 51, 234)],
+        [(139, 69, 19), (202, 138, 4)]
+    ],
+    "그린 그라데이션": [
+        [(46, 204, 113), (39, 174, 96)],
+        [(34, 197, 94), (22, 163, 74)],
+        [(16, 185, 129), (5, 150, 105)]
+    ],
+    "오렌지 그라데이션": [
+        [(230, 126, 34), (231, 76, 60)],
+        [(251, 146, 60), (249, 115, 22)],
+        [(202, 138, 4), (161, 98, 7)]
+    ],
+    "다크 그라데이션": [
+        [(44, 62, 80), (52, 73, 94)],
+        [(30, 41, 59), (55, 65, 81)],
+        [(15, 23, 42), (30, 41, 59)]
+    ],
+    "핑크 그라데이션": [
+        [(253, 121, 168), (232, 93, 117)],
+        [(244, 114, 182), (219, 39, 119)],
+        [(236, 72, 153), (190, 24, 93)]
+    ],
+    "민트 그라데이션": [
+        [(26, 188, 156), (22, 160, 133)],
+        [(16, 185, 129), (5, 150, 105)],
+        [(45, 212, 191), (20, 184, 166)]
+    ],
+    "선셋 그라데이션": [
+        [(255, 94, 77), (255, 154, 0)],
+        [(251, 146, 60), (249, 115, 22)],
+        [(245, 101, 101), (254, 178, 178)]
+    ]
+}
+
+# 기본 그라데이션 색상
+DEFAULT_GRADIENT_COLORS = [
+    [(52, 73, 219), (73, 150, 219)],
+    [(106, 90, 205), (147, 51, 234)],
+    [(46, 204, 113), (39, 174, 96)]
+]
+
+# 한글 폰트 디렉터리 (렌더링 중에는 여기서 읽기만 함)
+FONT_DIR = Path(os.environ.get("CARDNEWS_FONT_DIR", "fonts"))
+
+# 네트워크 없이 폰트를 설치할 로컬 번들 위치 (환경 변수는 os.pathsep로 여러 개 지정)
+FONT_BUNDLE_DIRS = [
+    Path(path) for path in os.environ.get("CARDNEWS_FONT_BUNDLE", "").split(os.pathsep) if path
+] + [
+    Path("/usr/share/fonts/truetype/nanum"),
+    Path("/usr/share/fonts/nanum"),
+    Path("/usr/local/share/fonts")
+]
+
+# 굵기 → (설치할 파일 이름, 번들에서 찾을 파일 이름들: 배포판 패키지는 이름이 다름)
+KOREAN_FONT_FILES = {
+    'regular': ("NanumGothic-Regular.ttf", ("NanumGothic-Regular.ttf", "NanumGothic.ttf")),
+    'bold': ("NanumGothic-Bold.ttf", ("NanumGothic-Bold.ttf", "NanumGothicBold.ttf"))
+}
+
+# 나눔고딕 폰트 URL (Google Fonts GitHub에서 제공)
+KOREAN_FONT_URLS = {
+    "NanumGothic-Regular.ttf": "https://github.com/google/fonts/raw/main/ofl/nanumgothic/NanumGothic-Regular.ttf",
+    "NanumGothic-Bold.ttf": "https://github.com/google/fonts/raw/main/ofl/nanumgothic/NanumGothic-Bold.ttf"
+}
+
+def get_font_path(weight='regular'):
+    """굵기별 설치 위치"""
+    name, _ = KOREAN_FONT_FILES['bold' if weight == 'bold' else 'regular']
+    return FONT_DIR / name
+
+# 폰트 다운로드 및 설정
+def download_korean_fonts():
+    """한글 폰트 자동 다운로드 및 설정 (준비 단계 전용, 렌더링 중에는 호출하지 않음)"""
+    
+    FONT_DIR.mkdir(parents=True, exist_ok=True)
+    
+    downloaded_fonts = {}
+    
+    for font_name, url in KOREAN_FONT_URLS.items():
+        font_path = FONT_DIR / font_name
+        
+        # 이미 존재하면 스킵
+        if font_path.exists():
+            downloaded_fonts[font_name] = str(font_path)
+            continue
+            
+        try:
+            with get_reporter().stage(f"한글 폰트 다운로드 중... ({font_name})"):
+                font_data = fetch_bytes(url, timeout=30)
+                
+                with open(font_path, 'wb') as f:
+                    f.write(font_data)
+                    
+                downloaded_fonts[font_name] = str(font_path)
+                get_reporter().success(f"✅ {font_name} 다운로드 완료!")
+                
+        except Exception as e:
+            get_reporter().warning(f"⚠️ {font_name} 다운로드 실패: {e}")
+            continue
+    
+    return downloaded_fonts
+
+def check_font_file(path):
+    """폰트 파일 상태: "ok", "no_hangul"(한글 글리프 없음), "invalid"(읽을 수 없음)"""
+    try:
+        font = ImageFont.truetype(str(path), 24)
+    except Exception:
+        return "invalid"
+    
+    # 글리프가 없으면 두 글자 모두 같은 빈 상자(.notdef)로 그려짐
+    def glyph(char):
+        img = Image.new('L', (32, 32))
+        ImageDraw.Draw(img).text((2, 2), char, font=font, fill=255)
+        return img.tobytes()
+    
+    if glyph("가") == glyph("힣"):
+        return "no_hangul"
+    return "ok"
+
+def find_bundled_font(candidates):
+    """로컬 번들 위치에서 폰트 파일 찾기 (없으면 None)"""
+    for directory in FONT_BUNDLE_DIRS:
+        for name in candidates:
+            path = directory / name
+            if path.is_file():
+                return path
+    return None
+
+def install_korean_fonts(download=False):
+    """한글 폰트 설치 확인 → {굵기: 상태}
+    
+    상태: "ok"(이미 있음), "installed"(로컬 번들에서 복사), "downloaded", "no_hangul"(한글 글리프 없음, 그대로 둠), "missing"
+    download=True일 때만 네트워크로 받는다 (앱·서비스 시작 시 준비 단계).
+    """
+    FONT_DIR.mkdir(parents=True, exist_ok=True)
+    statuses = {}
+    
+    for weight, (name, candidates) in KOREAN_FONT_FILES.items():
+        target = FONT_DIR / name
+        status = check_font_file(target) if target.exists() else "missing"
+        
+        if status == "invalid" or status == "missing":
+            bundled = find_bundled_font(candidates)
+            if bundled is not None and check_font_file(bundled) == "ok":
+                # 다른 프로세스가 반쯤 복사된 파일을 읽지 않도록 임시 이름으로 복사 후 교체
+                tmp_path = target.with_name(f".{name}.tmp{os.getpid()}")
+                shutil.copyfile(bundled, tmp_path)
+                os.replace(tmp_path, target)
+                status = "installed"
+            else:
+                status = "missing"
+        
+        statuses[weight] = status
+    
+    if download and "missing" in statuses.values():
+        for weight in [weight for weight, status in statuses.items() if status == "missing"]:
+            get_font_path(weight).unlink(missing_ok=True)
+        download_korean_fonts()
+        for weight, status in statuses.items():
+            if status == "missing" and get_font_path(weight).exists():
+                statuses[weight] = "downloaded" if check_font_file(get_font_path(weight)) != "invalid" else "missing"
+    
+    return statuses
+
+def get_korean_font(size=60, weight='regular'):
+    """한글 폰트 로드 (네트워크 없이 설치된 파일·로컬 번들만 사용)"""
+    
+    local_font = get_font_path(weight)
+    
+    # 없으면 로컬 번들에서만 설치 시도 (다운로드는 준비 단계에서)
+    if not local_font.exists():
+        install_korean_fonts(download=False)
+    
+    if not local_font.exists():
+        get_reporter().error("❌ 한글 폰트를 로드할 수 없습니다! (python warmup.py로 설치)")
+        return None
+    
+    # 프로세스 전역 캐시
+    try:
+        return font_registry.get(local_font, size, weight)
+    except Exception as e:
+        get_reporter().error(f"폰트 로딩 오류: {e}")
+        return None
+
+def get_optimized_font_sizes(width, height):
+    """플랫폼 크기에 따른 최적 폰트 크기 계산"""
+    
+    # 기준 크기 (Instagram Story 1080x1920)
+    base_width, base_height = 1080, 1920
+    base_title_size = 75
+    base_subtitle_size = 48
+    base_content_size = 38
+    base_page_size = 30
+    
+    # 크기 비율 계산 (면적 기준)
+    area_ratio = (width * height) / (base_width * base_height)
+    size_multiplier = area_ratio ** 0.5  # 제곱근으로 적절한 스케일링
+    
+    # 최소/최대 제한
+    size_multiplier = max(0.6, min(1.5, size_multiplier))
+    
+    return {
+        'title': int(base_title_size * size_multiplier),
+        'subtitle': int(base_subtitle_size * size_multiplier),
+        'content': int(base_content_size * size_multiplier),
+        'page': int(base_page_size * size_multiplier)
+    }
+
+def preload_platform_fonts():
+    """모든 플랫폼 프리셋의 폰트 크기를 미리 로드 (원본·미리보기 크기)"""
+    
+    regular_font = get_font_path('regular')
+    bold_font = get_font_path('bold')
+    
+    if not (regular_font.exists() and bold_font.exists()):
+        return
+    
+    regular_sizes = set()
+    bold_sizes = set()
+    
+    for width, height, _ in PLATFORM_SIZES.values():
+        for scale in (1.0, get_preview_scale(width, height)):
+            font_sizes = scale_metrics(get_optimized_font_sizes(width, height), scale)
+            bold_sizes.add(font_sizes['title'])
+            regular_sizes.update([
+                font_sizes['subtitle'],
+                font_sizes['content'],
+                font_sizes['page']
+            ])
+    
+    font_registry.preload(bold_font, sorted(bold_sizes), 'bold')
+    font_registry.preload(regular_font, sorted(regular_sizes), 'regular')
+
+def get_optimized_spacing(width, height):
+    """플랫폼 크기에 따른 최적 간격 계산"""
+    
+    # 기준 간격값들
+    base_margin = 60
+    base_y_start = 100
+    base_padding = 30
+    
+    # 크기에 따른 스케일링
+    area_ratio = (width * height) / (1080 * 1920)
+    scale = area_ratio ** 0.5
+    scale = max(0.7, min(1.3, scale))
+    
+    return {
+        'margin': int(base_margin * scale),
+        'y_start': int(base_y_start * scale),
+        'padding': int(base_padding * scale),
+        'line_height': int(50 * scale),
+        'section_gap': int(40 * scale)
+    }
+
+# 미리보기 카드의 긴 변 최대 길이(px) (화면 표시용 축소판)
+PREVIEW_MAX_SIDE = int(os.environ.get("CARDNEWS_PREVIEW_MAX_SIDE", "640"))
+
+def get_preview_scale(width, height):
+    """미리보기 축소 비율 (긴 변이 PREVIEW_MAX_SIDE 이하가 되도록, 작은 카드는 1.0)"""
+    return min(1.0, PREVIEW_MAX_SIDE / max(width, height))
+
+def get_scaled_size(width, height, scale):
+    """축소 비율을 적용한 캔버스 크기"""
+    if scale >= 1.0:
+        return width, height
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+def scale_length(value, scale):
+    """원본 크기 기준 길이(폰트 크기·간격)를 축소 비율에 맞춤 (최소 1px)"""
+    if scale >= 1.0:
+        return value
+    return max(1, round(value * scale))
+
+def scale_metrics(metrics, scale):
+    """get_optimized_font_sizes·get_optimized_spacing 결과에 축소 비율 적용"""
+    return {name: scale_length(value, scale) for name, value in metrics.items()}
+
+# AI 이미지 API 주소 (로컬 테스트 서버로 바꿔 끼울 수 있도록 분리)
+PROVIDER_BASE_URLS = {
+    "pollinations": "https://image.pollinations.ai/prompt/",
+    "picsum": "https://picsum.photos",
+    "unsplash": "https://source.unsplash.com"
+}
+
+# 카드 배경 동시 다운로드 수
+BACKGROUND_FETCH_WORKERS = int(os.environ.get("CARDNEWS_BACKGROUND_WORKERS", "4"))
+
+# 배경 API 호출 순서 및 헤징 설정
+BACKGROUND_PROVIDER_ORDER = ["pollinations", "lorem_picsum_varied", "unsplash_source", "placeholder_pics"]
+BACKGROUND_HEDGING = os.environ.get("CARDNEWS_BACKGROUND_HEDGING", "1") == "1"
+# 이 시간(초) 안에 응답이 없으면 다음 API를 병렬로 추가 호출
+BACKGROUND_HEDGE_BUDGETS = {
+    "pollinations": 8.0,
+    "lorem_picsum_varied": 4.0,
+    "unsplash_source": 4.0
+}
+# 블러 배경을 받아올 해상도 비율 (1.0이면 원본 크기 그대로)
+BACKGROUND_DRAFT_SCALE = float(os.environ.get("CARDNEWS_BACKGROUND_DRAFT_SCALE", "0.25"))
+# 카드 하나의 배경 생성에 허용하는 전체 시간(초)
+BACKGROUND_CARD_DEADLINE = float(os.environ.get("CARDNEWS_BACKGROUND_DEADLINE", "60"))
+# 텍스트 가독성을 위해 모든 카드 배경에 적용하는 밝기 배율 (30% 어둡게)
+CARD_DARKENING = 0.7
+
+# AI 이미지 생성 함수들
+def extract_keywords_from_content(card_content):
+    """카드 내용에서 이미지 생성용 키워드 추출"""
+    
+    # 한글 키워드를 영어로 매핑
+    korean_to_english = {
+        "예산": "budget money finance",
+        "관리": "management organization",
+        "결혼": "wedding marriage",
+        "예식": "ceremony celebration",
+        "드레스": "dress fashion elegant",
+        "허니문": "honeymoon travel romantic",
+        "신혼집": "home house interior",
+        "웨딩": "wedding bride groom",
+        "투자": "investment finance business",
+        "주식": "stock market finance",
+        "부동산": "real estate property",
+        "창업": "startup business entrepreneur",
+        "마케팅": "marketing business strategy",
+        "건강": "health wellness fitness",
+        "요리": "cooking food kitchen",
+        "여행": "travel adventure journey",
+        "교육": "education learning study",
+        "기술": "technology innovation digital",
+        "패션": "fashion style trendy",
+        "뷰티": "beauty cosmetics skincare"
+    }
+    
+    keywords = []
+    content_lower = card_content.lower()
+    
+    for korean, english in korean_to_english.items():
+        if korean in content_lower:
+            keywords.append(english)
+    
+    return " ".join(keywords[:3])  # 최대 3개 키워드만 사용
+
+def generate_ai_background_advanced(card_content, card_number, theme="비즈니스", width=1080, height=1920, style="modern"):
+    """고품질 AI 배경 이미지 생성 (카드별 맞춤형)"""
+    
+    # 카드 내용에서 키워드 추출
+    content_keywords = extract_keywords_from_content(card_content)
+    return generate_keyword_background(content_keywords, card_number, theme, width, height, style)
+
+def generate_keyword_background(content_keywords, card_number, theme="비즈니스", width=1080, height=1920, style="modern"):
+    """추출된 키워드로 AI 배경 생성 (배경은 키워드·카드 번호·테마·크기·스타일로만 결정됨)
+    
+    카드 본문 전체가 아니라 이 인자들만 캐시 키가 되므로, 키워드가 그대로인 오타 수정은 배경을 다시 받지 않는다.
+    반환하는 배경은 카드용 어둡게 처리(CARD_DARKENING)까지 끝난 상태다.
+    """
+    
+    # 테마별 기본 프롬프트
+    theme_prompts = {
+        "비즈니스": "professional business office modern clean minimal",
+        "자연": "nature landscape beautiful serene peaceful outdoor",
+        "기술": "technology futuristic digital modern innovation tech",
+        "음식": "food cooking kitchen restaurant culinary delicious",
+        "여행": "travel destination adventure scenic beautiful landscape",
+        "패션": "fashion style elegant modern trendy lifestyle",
+        "교육": "education learning study books knowledge academic",
+        "건강": "health wellness fitness lifestyle clean minimalist",
+        "라이프스타일": "lifestyle modern cozy comfortable home living",
+        "창의적": "creative artistic colorful vibrant inspiring abstract"
+    }
+    
+    base_prompt = theme_prompts.get(theme, "modern minimalist professional")
+    
+    # 카드별 고유 프롬프트 생성
+    card_specific_prompt = f"{base_prompt} {content_keywords} card{card_number}"
+    
+    # 강한 블러는 원본 해상도가 필요 없으므로 축소 해상도로 받아 처리한 뒤 한 번만 확대
+    fetch_width, fetch_height = get_draft_size(width, height, get_draft_scale(style))
+    
+    # 다양한 AI 이미지 API 시도 (우선순위대로, 설정된 순서 적용)
+    ai_apis = {
+        "pollinations": generate_pollinations_image,
+        "lorem_picsum_varied": generate_varied_picsum,
+        "unsplash_source": generate_unsplash_source,
+        "placeholder_pics": generate_placeholder_pics
+    }
+    
+    # 작업 스레드에서도 API 경고가 호출 측(예: Streamlit 세션)에 전달되도록 컨텍스트 전달
+    reporter = get_reporter()
+    ctx = reporter.capture_context()
+    trace = capture_trace()
+    
+    def make_attempt(api_name, api_function):
+        def attempt(cancel):
+            reporter.attach_context(ctx)
+            # API 시도마다 span 하나 (실패·다른 API에 밀려 취소된 시도도 기록)
+            with use_trace(trace), span("background.provider", provider=api_name) as attempt_span:
+                img = api_function(card_specific_prompt, fetch_width, fetch_height, card_number, cancel)
+                if img is None:
+                    attempt_span.outcome = "cancelled" if cancel.is_set() else "failed"
+                return img
+        return attempt
+    
+    attempts = [
+        (api_name, make_attempt(api_name, ai_apis[api_name]))
+        for api_name in BACKGROUND_PROVIDER_ORDER
+        if api_name in ai_apis
+    ]
+    
+    # 헤징 모드: 지연 예산을 넘기면 다음 API를 병렬로 추가 호출해 먼저 온 결과 사용
+    budgets = BACKGROUND_HEDGE_BUDGETS if BACKGROUND_HEDGING else None
+    api_name, img, errors = race_providers(attempts, budgets, BACKGROUND_CARD_DEADLINE)
+    
+    for failed_api, error in errors:
+        get_reporter().warning(f"⚠️ {failed_api} 실패: {error}")
+    
+    if img:
+        # 스타일 후처리와 카드용 어둡게 처리를 축소 해상도에서 한 번에 적용한 뒤 목표 크기로 확대
+        with span("background.effects", style=style):
+            img = apply_image_effects(img, style, img.width / width, brightness=CARD_DARKENING)
+            if img.size != (width, height):
+                img = img.resize((width, height), Image.Resampling.BICUBIC)
+        get_reporter().success(f"✅ {api_name}으로 카드 {card_number} 배경 생성 완료!")
+        return img
+    
+    # 모든 AI API 실패시 고급 그라데이션으로 대체
+    get_reporter().warning(f"모든 AI API 실패. 고급 그라데이션으로 대체합니다.")
+    return create_advanced_gradient(width, height, theme, card_number, darkening=CARD_DARKENING)
+
+def get_draft_scale(style):
+    """스타일별 배경 다운로드/처리 해상도 비율 (블러 배경만 축소)"""
+    if style == "blur":
+        return min(1.0, max(0.05, BACKGROUND_DRAFT_SCALE))
+    return 1.0
+
+def get_draft_size(width, height, scale):
+    """축소 해상도 크기 (너무 작아지지 않도록 최소 64px)"""
+    if scale >= 1.0:
+        return width, height
+    return max(64, round(width * scale)), max(64, round(height * scale))
+
+def get_card_content(card_data):
+    """카드 내용 조합 (키워드 추출용)"""
+    return f"{card_data.get('title', '')} {card_data.get('subtitle', '')} {card_data.get('content', '')}"
+
+def get_card_keywords(card_data):
+    """카드 배경 프롬프트에 들어가는 키워드"""
+    return extract_keywords_from_content(get_card_content(card_data))
+
+def fetch_card_backgrounds(cards_data, theme="비즈니스", width=1080, height=1920, style="blur", max_workers=None, generate=None, card_numbers=None):
+    """카드들의 AI 배경을 병렬로 받아오기 (결과는 카드 순서대로)
+    
+    generate: (키워드, 카드 번호, 테마, 너비, 높이, 스타일) → 이미지 (기본 generate_keyword_background)
+    card_numbers: 일부 카드만 받을 때 각 카드의 번호 (기본은 1부터 차례로)
+    """
+    
+    if max_workers is None:
+        max_workers = BACKGROUND_FETCH_WORKERS
+    if generate is None:
+        generate = generate_keyword_background
+    if card_numbers is None:
+        card_numbers = range(1, len(cards_data) + 1)
+    
+    # 작업 스레드에서도 경고 메시지가 호출 측에 전달되도록 실행 컨텍스트 전달
+    reporter = get_reporter()
+    ctx = reporter.capture_context()
+    trace = capture_trace()
+    
+    def fetch(card_number, card_data):
+        reporter.attach_context(ctx)
+        with use_trace(trace), span("background.card") as card_span:
+            try:
+                img = generate(get_card_keywords(card_data), card_number, theme, width, height, style)
+            except Exception as e:
+                get_reporter().warning(f"⚠️ 카드 {card_number} 배경 생성 실패: {e}")
+                img = None
+            
+            # 실패한 카드만 개별적으로 그라데이션 대체
+            if img is None:
+                card_span.outcome = "fallback"
+                img = create_advanced_gradient(width, height, theme, card_number, darkening=CARD_DARKENING)
+            return img
+    
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = [
+            executor.submit(fetch, card_number, card_data)
+            for card_number, card_data in zip(card_numbers, cards_data)
+        ]
+        for done, _ in enumerate(as_completed(futures), 1):
+            reporter.progress(done, len(futures), "배경 생성")
+        return [future.result() for future in futures]
+
+def stable_seed(text, modulo):
+    """재시작해도 같은 값이 나오는 시드 (hash()는 프로세스마다 달라짐)"""
+    return int(content_key(text)[:12], 16) % modulo
+
+def download_background_bytes(provider, url, timeout, prompt, width, height, seed, cancel=None):
+    """배경 이미지 원본 다운로드 (provider·프롬프트·크기·시드 기준 디스크 캐시 우선)"""
+    
+    key = content_key(provider, prompt, width, height, seed)
+    with span("background.download", provider=provider) as download_span:
+        data = background_cache.get(key)
+        if data is not None:
+            download_span.outcome = "cache_hit"
+            return data
+        
+        # 공유 세션으로 다운로드 (연결 재사용, 429/5xx 재시도, 응답 크기 제한)
+        data = fetch_bytes(url, timeout=timeout, cancel=cancel)
+        
+        # 이미지가 아닌 응답(오류 페이지 등)은 캐시하지 않음
+        Image.open(io.BytesIO(data)).verify()
+        background_cache.put(key, data)
+        return data
+
+def decode_background(data, width, height):
+    """다운로드한 배경 바이트를 요청 크기의 RGB 이미지로 디코딩"""
+    with span("background.decode"):
+        img = Image.open(io.BytesIO(data))
+        
+        # 이미지 크기 검증
+        if img.size != (width, height):
+            img = img.resize((width, height), Image.Resampling.LANCZOS)
+        
+        # RGB 모드로 확실히 변환
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+        
+        # 디코딩 시간이 뒤 단계(효과 처리)에 섞이지 않도록 여기서 픽셀을 읽음
+        img.load()
+        return img
+
+def generate_pollinations_image(prompt, width, height, card_number, cancel=None):
+    """Pollinations AI API로 고품질 이미지 생성"""
+    try:
+        # Pollinations API 엔드포인트
+        base_url = PROVIDER_BASE_URLS["pollinations"]
+        
+        # 프롬프트 최적화 (안전한 인코딩)
+        optimized_prompt = f"{prompt} high quality professional photography 4k ultra detailed"
+        # URL 인코딩
+        import urllib.parse
+        optimized_prompt = urllib.parse.quote(optimized_prompt)
+        
+        # 카드별 시드 생성 (다른 이미지를 위해, 재시작해도 동일)
+        seed = stable_seed(f"{prompt}_{card_number}", 10000)
+        
+        # API URL 구성
+        api_url = f"{base_url}{optimized_prompt}?width={width}&height={height}&seed={seed}&enhance=true&model=flux"
+        
+        # 이미지 요청 (디스크 캐시 우선)
+        data = download_background_bytes("pollinations", api_url, 45, prompt, width, height, seed, cancel)
+        
+        # 이미지 디코딩 및 크기·모드 맞춤
+        return decode_background(data, width, height)
+        
+    except RequestCancelled:
+        # 헤징 경쟁에서 다른 API가 먼저 응답한 경우 (경고 불필요)
+        return None
+    except Exception as e:
+        get_reporter().warning(f"Pollinations API 오류: {e}")
+        return None
+
+def generate_varied_picsum(prompt, width, height, card_number, cancel=None):
+    """다양한 Picsum 이미지 생성 (카드별 다름)"""
+    try:
+        # 프롬프트와 카드 번호로 시드 생성
+        seed = stable_seed(f"{prompt}_{card_number}", 1000)
+        
+        # 다양한 이미지를 위해 카테고리별 시드 범위 설정
+        category_seeds = {
+            "business": range(100, 200),
+            "nature": range(200, 300),
+            "technology": range(300, 400),
+            "food": range(400, 500),
+            "lifestyle": range(500, 600),
+            "wedding": range(600, 700),
+            "finance": range(700, 800)
+        }
+        
+        # 프롬프트에서 카테고리 감지
+        category = "business"  # 기본값
+        for cat in category_seeds.keys():
+            if cat in prompt.lower():
+                category = cat
+                break
+        
+        # 해당 카테고리의 시드 범위에서 선택
+        seed_range = category_seeds[category]
+        actual_seed = seed_range.start + (seed % len(seed_range))
+        
+        # Picsum API 호출
+        url = f"{PROVIDER_BASE_URLS['picsum']}/seed/{actual_seed}/{width}/{height}"
+        data = download_background_bytes("picsum", url, 30, category, width, height, actual_seed, cancel)
+        
+        # 이미지 디코딩 및 크기·모드 맞춤
+        return decode_background(data, width, height)
+        
+    except RequestCancelled:
+        # 헤징 경쟁에서 다른 API가 먼저 응답한 경우 (경고 불필요)
+        return None
+    except Exception as e:
+        get_reporter().warning(f"Varied Picsum 오류: {e}")
+        return None
+
+def generate_unsplash_source(prompt, width, height, card_number, cancel=None):
+    """Unsplash Source API로 테마별 이미지 생성"""
+    try:
+        # 프롬프트에서 검색어 추출 (안전하게)
+        search_terms = [term.strip() for term in prompt.replace(" ", ",").split(",") if term.strip()][:3]
+        search_query = ",".join(search_terms) if search_terms else "business"
+        
+        # Unsplash Source API
+        url = f"{PROVIDER_BASE_URLS['unsplash']}/{width}x{height}/?{search_query}"
+        
+        data = download_background_bytes("unsplash", url, 30, search_query, width, height, None, cancel)
+        
+        # 이미지 디코딩 및 크기·모드 맞춤
+        return decode_background(data, width, height)
+        
+    except RequestCancelled:
+        # 헤징 경쟁에서 다른 API가 먼저 응답한 경우 (경고 불필요)
+        return None
+    except Exception as e:
+        get_reporter().warning(f"Unsplash Source 오류: {e}")
+        return None
+
+def generate_placeholder_pics(prompt, width, height, card_number, cancel=None):
+    """안전한 플레이스홀더 이미지 생성"""
+    try:
+        # 카드별 다른 색상 조합
+        colors = [
+            "#4A90E2",  # 파란색
+            "#7ED321",  # 초록색
+            "#F5A623",  # 주황색
+            "#BD10E0",  # 보라색
+            "#B8E986",  # 연두색
+        ]
+        
+        bg_color = colors[card_number % len(colors)]
+        
+        # 간단한 색상 배경 생성
+        img = Image.new('RGB', (width, height), bg_color)
+        
+        return img
+        
+    except Exception as e:
+        get_reporter().warning(f"Placeholder 생성 오류: {e}")
+        return None
+
+def apply_image_effects(img, style, scale=1.0, brightness=1.0):
+    """이미지에 스타일 효과 적용 (안전한 처리, scale: 최종 크기 대비 현재 이미지 비율)"""
+    if not img:
+        return img
+    
+    try:
+        # 블러/어둡게/빈티지/모던 효과와 밝기 조정을 LUT·행렬로 합쳐 한두 번에 처리
+        return apply_fused_effects(img, style, scale, brightness)
+        
+    except Exception as e:
+        get_reporter().warning(f"이미지 효과 적용 실패: {e}")
+        # 실패시 원본 이미지에 밝기 조정만 적용해서 반환
+        try:
+            return darken_image(img, brightness)
+        except:
+            return img
+
+def get_gradient_colors(theme):
+    """테마별 그라데이션 색상 조합 목록"""
+    return GRADIENT_THEME_COLORS.get(theme, DEFAULT_GRADIENT_COLORS)
+
+def render_gradient_template(width, height, theme, color_index, darkening=1.0):
+    """그라데이션 배경 생성 (캐시 없이 매번 계산, darkening: 밝기 배율)"""
+    start_color, end_color = get_gradient_colors(theme)[color_index]
+    
+    # 대각선 그라데이션 효과 (벡터 연산)
+    img = render_diagonal_gradient(width, height, start_color, end_color)
+    
+    if darkening != 1.0:
+        img = darken_image(img, darkening)
+    return img
+
+def create_advanced_gradient(width, height, theme, card_number, darkening=1.0):
+    """고급 그라데이션 배경 생성 (카드별 다름, 미리 계산된 템플릿의 사본)"""
+    
+    # 테마별 색상 조합은 몇 개뿐이므로 (테마, 색상 번호, 크기, 밝기)별로 한 번만 계산
+    color_index = card_number % len(get_gradient_colors(theme))
+    key = (theme, color_index, width, height, darkening)
+    
+    return gradient_templates.get(
+        key,
+        lambda: render_gradient_template(width, height, theme, color_index, darkening)
+    )
+
+def warm_gradient_templates(themes=None, platforms=None, darkening=CARD_DARKENING):
+    """플랫폼 프리셋별 그라데이션 템플릿 미리 생성 (기본: 카드에 쓰이는 어둡게 처리된 버전)"""
+    
+    if themes is None:
+        themes = [theme for theme in GRADIENT_THEME_COLORS if theme.endswith("그라데이션")]
+    if platforms is None:
+        platforms = list(PLATFORM_SIZES.keys())
+    
+    for platform in platforms:
+        width, height, _ = PLATFORM_SIZES[platform]
+        for theme in themes:
+            for color_index in range(len(get_gradient_colors(theme))):
+                stored = gradient_templates.warm(
+                    (theme, color_index, width, height, darkening),
+                    lambda: render_gradient_template(width, height, theme, color_index, darkening)
+                )
+                if not stored:
+                    # 용량 한도에 도달하면 중단 (이미 있는 템플릿은 밀어내지 않음)
+                    return
+
+def draw_text_with_shadow(draw, position, text, font, text_color='white', shadow_color=(0, 0, 0, 180), shadow_offset=(3, 3)):
+    """그림자 효과가 있는 텍스트 그리기"""
+    x, y = position
+    
+    # 그림자 그리기
+    draw.text((x + shadow_offset[0], y + shadow_offset[1]), text, font=font, fill=shadow_color)
+    
+    # 메인 텍스트 그리기
+    draw.text((x, y), text, font=font, fill=text_color)
+
+def create_carousel_card(card_data, card_number, total_cards, background_type="ai", theme="비즈니스", width=1080, height=1920, background=None, scale=1.0):
+    """캐러셀용 개별 카드 생성 (플랫폼별 크기 최적화)
+
+    background: fetch_card_backgrounds로 미리 받은 배경 (어둡게 처리까지 끝난 상태)
+    scale: 1.0 미만이면 미리보기용 축소판 (원본 크기 카드와 같은 배치를 축소해 그림)
+    """
+    
+    canvas_size = get_scaled_size(width, height, scale)
+    
+    # 배경 생성 (카드별 다른 이미지, 어느 경로든 CARD_DARKENING까지 적용된 상태로 받음)
+    with span("card.background", source="prefetched" if background is not None else background_type):
+        if background is not None:
+            # 배경 단계에서 미리 받아온 이미지 사용
+            img = background
+        elif background_type == "ai":
+            img = generate_ai_background_advanced(
+                card_content=get_card_content(card_data),
+                card_number=card_number,
+                theme=theme, 
+                width=width, 
+                height=height, 
+                style="blur"
+            )
+            if img is None:
+                # AI 생성 실패시 고급 그라데이션으로 대체
+                img = create_advanced_gradient(*canvas_size, theme, card_number, darkening=CARD_DARKENING)
+        else:
+            # 그라데이션도 카드별로 다르게 (어둡게 처리까지 끝난 템플릿의 사본, 미리보기는 축소 크기 템플릿)
+            img = create_advanced_gradient(*canvas_size, theme, card_number, darkening=CARD_DARKENING)
+        
+        # 이미지 모드 통일 (RGB로 변환)
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+    
+    # 미리보기는 원본 크기 배경을 줄여 씀 (같은 배경이 원본 내보내기에서 그대로 재사용됨)
+    if img.size != canvas_size:
+        with span("card.resize"):
+            img = img.resize(canvas_size, Image.BILINEAR, reducing_gap=2.0)
+    
+    # 배경 단계에서 받은 이미지가 그대로 남아 있으면 합성 전에 사본으로 (원본은 다른 카드·재렌더링에서 재사용)
+    if img is background:
+        img = img.copy()
+    
+    # 텍스트·패널은 배경과 무관하므로 캐시된 RGBA 레이어를 알파 합성
+    with span("card.text_layer"):
+        layer = get_text_layer(card_data, card_number, total_cards, width, height, scale)
+    if layer is None:
+        return None
+    
+    with span("card.composite"):
+        return composite_text_layer(img, layer)
+
+def get_text_layer(card_data, card_number, total_cards, width, height, scale=1.0):
+    """카드 텍스트 레이어 (텍스트·페이지 번호·크기·축소 비율이 같으면 테마·배경이 달라도 재사용)"""
+    key = (
+        card_data.get('title', ''),
+        card_data.get('subtitle', ''),
+        card_data.get('content', ''),
+        card_number,
+        total_cards,
+        width,
+        height,
+        scale
+    )
+    return text_layers.get(
+        key,
+        lambda: render_text_layer(card_data, card_number, total_cards, width, height, scale)
+    )
+
+# 본문이 넘칠 때 줄일 수 있는 최소 폰트 크기 (기본 본문 크기 대비)
+CONTENT_MIN_FONT_SCALE = float(os.environ.get("CARDNEWS_CONTENT_MIN_FONT_SCALE", "0.6"))
+
+def plan_card_layout(card_data, card_number, total_cards, width, height, scale=1.0):
+    """카드 텍스트 레이아웃 계획 (그릴 사각형·텍스트와 위치, 폰트가 없으면 None)
+
+    본문은 화면 하단을 넘지 않는 가장 큰 폰트 크기를 찾아 배치한다.
+    scale: 원본 크기 기준 폰트 크기·간격을 이 비율로 줄여 축소 캔버스에 배치 (미리보기)
+    반환: {'ops': [('rect', 상자, 색) 또는 ('text', 위치, 텍스트, 폰트, 색)],
+           'content_size', 'content_line_height', 'content_fits', 'content_attempts'(시도한 크기 수)}
+    """
+    
+    # 플랫폼별 최적화된 폰트 크기 및 간격 계산 (원본 크기 기준값에 축소 비율 적용)
+    font_sizes = scale_metrics(get_optimized_font_sizes(width, height), scale)
+    spacing = scale_metrics(get_optimized_spacing(width, height), scale)
+    page_margin = scale_length(max(15, width // 72), scale)
+    shadow_offset = (scale_length(max(2, width//540), scale), scale_length(max(2, height//960), scale))
+    
+    # 이후 배치는 실제로 그릴 캔버스 크기 기준
+    width, height = get_scaled_size(width, height, scale)
+    
+    # 폰트 로드 (플랫폼별 최적화)
+    title_font = get_korean_font(font_sizes['title'], 'bold')
+    subtitle_font = get_korean_font(font_sizes['subtitle'], 'regular')
+    page_font = get_korean_font(font_sizes['page'], 'regular')
+    
+    if not title_font:
+        return None
+    
+    ops = []
+    plan = {
+        'ops': ops,
+        'content_size': None,
+        'content_line_height': None,
+        'content_fits': True,
+        'content_attempts': 0
+    }
+    
+    margin = spacing['margin']
+    y_position = spacing['y_start']
+    
+    # 페이지 번호 표시 (우상단)
+    page_text = f"{card_number}/{total_cards}"
+    page_width, page_height = get_text_dimensions(page_text, page_font)
+    
+    ops.append(('rect', [width - page_width - page_margin*2, page_margin, 
+                         width - page_margin//2, page_margin + page_height + page_margin], 
+                (255, 255, 255, 200)))
+    ops.append(('text', (width - page_width - page_margin, page_margin + page_margin//2), 
+                page_text, page_font, '#2c3e50'))
+    
+    # 1. 제목
+    title = card_data.get('title', '')
+    if title:
+        title_lines = wrap_text(title, title_font, width - margin * 2)
+        
+        for line in title_lines:
+            text_width, text_height = get_text_dimensions(line, title_font)
+            x = (width - text_width) // 2
+            
+            # 제목 배경
+            padding = spacing['padding']
+            ops.append(('rect', [x - padding, y_position - padding//2, 
+                                 x + text_width + padding, y_position + text_height + padding//2], 
+                        (0, 0, 0, 160)))
+            
+            # 텍스트 (그림자 효과)
+            ops.append(('text', (x + shadow_offset[0], y_position + shadow_offset[1]), line, title_font, (0, 0, 0, 180)))
+            ops.append(('text', (x, y_position), line, title_font, 'white'))
+            
+            y_position += text_height + spacing['line_height']//3
+        
+        y_position += spacing['section_gap']
+    
+    # 2. 부제목
+    subtitle = card_data.get('subtitle', '')
+    if subtitle:
+        subtitle_lines = wrap_text(subtitle, subtitle_font, width - margin * 2)
+        
+        for line in subtitle_lines:
+            text_width, text_height = get_text_dimensions(line, subtitle_font)
+            x = (width - text_width) // 2
+            
+            # 부제목 배경
+            padding = int(spacing['padding'] * 0.8)
+            ops.append(('rect', [x - padding, y_position - padding//2, 
+                                 x + text_width + padding, y_position + text_height + padding//2], 
+                        (255, 255, 255, 220)))
+            ops.append(('text', (x, y_position), line, subtitle_font, '#2c3e50'))
+            
+            y_position += text_height + spacing['line_height']//4
+        
+        y_position += int(spacing['section_gap'] * 1.5)
+    
+    # 3. 내용 (화면 하단까지 남은 높이에 맞춰 폰트 크기 결정)
+    content = card_data.get('content', '')
+    if content:
+        paragraphs = content.split('\n')
+        max_widths = [
+            width - margin * 2 - spacing['padding']
+            if paragraph.strip().startswith('•') or paragraph.strip().startswith('-')
+            else width - margin * 2
+            for paragraph in paragraphs
+        ]
+        
+        bg_padding = int(spacing['padding'] * 1.3)
+        bottom_margin = height // 20
+        content_size = font_sizes['content']
+        
+        fitted = fit_text_block(
+            paragraphs,
+            max_widths,
+            load_font=lambda size: get_korean_font(size, 'regular'),
+            max_size=content_size,
+            min_size=max(1, int(content_size * CONTENT_MIN_FONT_SCALE)),
+            line_height_for=lambda size: max(1, spacing['line_height'] * size // content_size),
+            max_height=height - bottom_margin - bg_padding//2 - y_position
+        )
+        content_font = fitted['font']
+        line_height = fitted['line_height']
+        all_lines = fitted['lines']
+        plan.update(
+            content_size=fitted['size'],
+            content_line_height=line_height,
+            content_fits=fitted['fits'],
+            content_attempts=fitted['attempts']
+        )
+        
+        # 불릿 포인트 스타일링 후 선택된 폰트로 폭 측정
+        styled_lines = []
+        for line in all_lines:
+            if line.strip().startswith('•'):
+                line = line.replace('•', '●')
+            elif line.strip().startswith('-'):
+                line = line.replace('-', '●')
+            styled_lines.append(line)
+        
+        max_line_width = max(
+            (get_text_dimensions(line, content_font)[0] for line in styled_lines if line),
+            default=0
+        )
+        
+        # 내용 전체 반투명 배경
+        bg_x1 = (width - max_line_width) // 2 - bg_padding
+        bg_x2 = (width + max_line_width) // 2 + bg_padding
+        bg_y1 = y_position - bg_padding//2
+        bg_y2 = y_position + fitted['height'] + bg_padding//2
+        ops.append(('rect', [bg_x1, bg_y1, bg_x2, bg_y2], (255, 255, 255, 240)))
+        
+        # 각 줄 위치
+        for line in styled_lines:
+            if line:
+                if line.strip().startswith('●'):
+                    # 불릿 포인트면 왼쪽 정렬
+                    x = bg_x1 + bg_padding//2
+                else:
+                    text_width, _ = get_text_dimensions(line, content_font)
+                    x = (width - text_width) // 2
+                
+                ops.append(('text', (x, y_position), line, content_font, '#2c3e50'))
+                y_position += line_height
+            else:
+                y_position += line_height // 2
+    
+    return plan
+
+def draw_layout_plan(draw, plan):
+    """레이아웃 계획을 그대로 그림 (측정 없음)"""
+    for op in plan['ops']:
+        if op[0] == 'rect':
+            _, box, fill = op
+            draw.rectangle(box, fill=fill)
+        else:
+            _, position, text, font, fill = op
+            draw.text(position, text, font=font, fill=fill)
+
+def render_text_layer(card_data, card_number, total_cards, width, height, scale=1.0):
+    """페이지 번호·제목·부제목·본문 패널을 투명 RGBA 레이어에 그림 (폰트가 없으면 None)"""
+    
+    with span("card.layout"):
+        plan = plan_card_layout(card_data, card_number, total_cards, width, height, scale)
+    if plan is None:
+        return None
+    
+    with span("card.draw"):
+        img = Image.new('RGBA', get_scaled_size(width, height, scale), (0, 0, 0, 0))
+        draw_layout_plan(ImageDraw.Draw(img), plan)
+        return crop_layer(img)
+
+def split_content_into_cards(title, subtitle, content, max_cards=5):
+    """콘텐츠를 여러 카드로 분할"""
+    
+    cards = []
+    
+    # 첫 번째 카드 (타이틀 카드)
+    cards.append({
+        'title': title,
+        'subtitle': subtitle,
+        'content': ''
+    })
+    
+    if not content:
+        return cards
+    
+    # 내용을 줄 단위로 분리
+    lines = [line.strip() for line in content.split('\n') if line.strip()]
+    
+    # 각 카드당 최대 줄 수
+    max_lines_per_card = max(1, len(lines) // (max_cards - 1))
+    
+    current_card_lines = []
+    
+    for i, line in enumerate(lines):
+        current_card_lines.append(line)
+        
+        # 카드가 가득 찼거나 마지막 줄인 경우
+        if len(current_card_lines) >= max_lines_per_card or i == len(lines) - 1:
+            if len(cards) < max_cards:
+                # 카드 제목 생성 (첫 번째 불릿 포인트에서 추출)
+                card_title = ""
+                if current_card_lines:
+                    first_line = current_card_lines[0]
+                    if first_line.startswith('•') or first_line.startswith('-'):
+                        card_title = first_line[1:].strip()[:20] + "..."
+                    else:
+                        card_title = f"{title} - {len(cards)}"
+                
+                cards.append({
+                    'title': card_title,
+                    'subtitle': '',
+                    'content': '\n'.join(current_card_lines)
+                })
+                
+                current_card_lines = []
+    
+    return cards[:max_cards]
+
+def get_card_filename(card_number, card_data, extension="png"):
+    """카드 이미지 파일명 생성"""
+    return f"카드_{card_number:02d}_{card_data['title'][:10].replace(' ', '_')}.{extension}"
+
+def background_fingerprint(card_data, card_number, background_type, theme, width, height, style="blur"):
+    """카드 배경을 결정하는 입력의 지문 (AI 배경은 본문 전체가 아니라 추출된 키워드만 반영)"""
+    if background_type == "ai":
+        return content_key("ai", theme, get_card_keywords(card_data), card_number, width, height, style)
+    return content_key("gradient", theme, card_number, width, height)
+
+def card_fingerprint(card_data, card_number, total_cards, background_type, theme, width, height, encoder, background_key, scale=1.0):
+    """완성된 카드 이미지를 결정하는 입력의 지문 (텍스트·페이지 번호·크기·축소 비율·폰트 크기·인코더 + 배경 지문)"""
+    font_sizes = get_optimized_font_sizes(width, height)
+    return content_key(
+        card_data.get('title', ''),
+        card_data.get('subtitle', ''),
+        card_data.get('content', ''),
+        card_number,
+        total_cards,
+        width,
+        height,
+        scale,
+        sorted(font_sizes.items()),
+        encoder,
+        background_key
+    )
+
+def render_carousel_card(card_data, card_number, total_cards, background_type="ai", theme="비즈니스", width=1080, height=1920, background=None, encoder=DEFAULT_ENCODER, scale=1.0):
+    """카드를 한 번만 렌더링/인코딩해서 미리보기·개별 다운로드·ZIP에서 재사용할 결과 생성
+
+    encoder: 출력 인코더 프로필 이름 (encoders.ENCODER_PROFILES, 미리보기는 encoders.PREVIEW_ENCODER)
+    scale: 1.0 미만이면 미리보기용 축소판 (background는 원본 크기 그대로 넘김)
+    """
+    
+    card_img = create_carousel_card(
+        card_data, 
+        card_number, 
+        total_cards, 
+        background_type, 
+        theme,
+        width,
+        height,
+        background,
+        scale
+    )
+    
+    if not card_img:
+        return None
+    
+    # 인코딩된 바이트만 보관 (원본 이미지는 바로 해제)
+    with span("card.encode", encoder=encoder):
+        image_bytes, encoding = encode_image(card_img, encoder)
+    return {
+        'card_number': card_number,
+        'card_data': card_data,
+        'filename': get_card_filename(card_number, card_data, encoding['extension']),
+        'image_bytes': image_bytes,
+        'mime': encoding['mime'],
+        'encoding': encoding
+    }
+
+def create_carousel_zip(rendered_cards, spool_bytes=None):
+    """렌더링이 끝난 카드들을 ZIP으로 묶기 (CarouselArchive 반환)
+
+    카드를 렌더링하면서 바로 ZIP에 넣으려면 CarouselArchive를 직접 만들어 add()한다.
+    """
+    with span("zip.build"):
+        archive = CarouselArchive(spool_bytes=spool_bytes)
+        for rendered in rendered_cards:
+            archive.add(rendered)
+        return archive.close()
@@ -0,0 +1,162 @@
+"""카드 이미지 출력 인코더 프로필 (PNG 압축 수준, WebP, 프로그레시브 JPEG)
+
+PNG의 optimize=True는 zlib 설정을 여러 번 시도하므로 카드 한 장 시간의 큰 부분을 차지한다.
+기본은 압축 수준을 낮춘 빠른 PNG이고, 보관용·WebP·JPEG는 필요할 때 고른다.
+"""
+
+import io
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from PIL import ImageFile
+
+# 프로필 이름 → Pillow 저장 형식·옵션
+ENCODER_PROFILES = {
+    "fast_png": {
+        'label': "빠른 PNG (무손실)",
+        'format': "PNG",
+        'extension': "png",
+        'mime': "image/png",
+        'options': {'compress_level': 2}
+    },
+    "archival_png": {
+        'label': "보관용 PNG (최대 압축, 느림)",
+        'format': "PNG",
+        'extension': "png",
+        'mime': "image/png",
+        'options': {'optimize': True}
+    },
+    "webp_lossless": {
+        'label': "WebP 무손실",
+        'format': "WEBP",
+        'extension': "webp",
+        'mime': "image/webp",
+        # 무손실 모드에서 quality는 압축 노력 정도
+        'options': {'lossless': True, 'quality': 50, 'method': 4}
+    },
+    "webp": {
+        'label': "WebP (고화질 손실 압축)",
+        'format': "WEBP",
+        'extension': "webp",
+        'mime': "image/webp",
+        'options': {'quality': 90, 'method': 4}
+    },
+    "jpeg": {
+        'label': "프로그레시브 JPEG",
+        'format': "JPEG",
+        'extension': "jpg",
+        'mime': "image/jpeg",
+        # 글자 가장자리 번짐을 줄이기 위해 색차 서브샘플링 없이(4:4:4) 저장
+        'options': {'quality': 92, 'progressive': True, 'optimize': True, 'subsampling': 0}
+    }
+}
+
+DEFAULT_ENCODER = "fast_png"
+
+# 화면 미리보기 썸네일 전용 프로필 (출력 형식 선택·배치 작업에는 노출하지 않음)
+PREVIEW_ENCODER = "preview_jpeg"
+PREVIEW_PROFILES = {
+    PREVIEW_ENCODER: {
+        'label': "미리보기 JPEG",
+        'format': "JPEG",
+        'extension': "jpg",
+        'mime': "image/jpeg",
+        # 축소판이라 화질보다 인코딩·전송 속도 우선 (글자 가장자리만 4:4:4로 유지)
+        'options': {'quality': 80, 'subsampling': 0}
+    }
+}
+
+# 플랫폼별 기본 프로필 (YouTube 썸네일은 업로드 용량 제한 2MB 때문에 JPEG)
+PLATFORM_ENCODERS = {
+    "Instagram Carousel": "fast_png",
+    "YouTube Thumbnail": "jpeg",
+    "Naver Blog": "fast_png",
+    "Facebook Post": "fast_png",
+    "Custom Size": "fast_png"
+}
+
+# 프로그레시브/최적화 JPEG는 libjpeg가 결과 전체를 출력 버퍼에 한 번에 써야 하는데,
+# Pillow는 버퍼를 가로x세로 바이트로 잡아 4:4:4·고화질 사진 카드에서는 넘친다 ("Suspension not allowed here").
+# 저장하는 동안 ImageFile.MAXBLOCK을 픽셀당 이만큼으로 올린다.
+JPEG_BUFFER_BYTES_PER_PIXEL = int(os.environ.get("CARDNEWS_JPEG_BUFFER_BYTES_PER_PIXEL", "4"))
+
+_default_maxblock = ImageFile.MAXBLOCK
+_jpeg_buffer_lock = threading.Lock()
+_jpeg_buffer_sizes = []  # 지금 저장 중인 JPEG별 필요한 버퍼 크기
+
+# 설정하면 플랫폼과 관계없이 이 프로필을 기본값으로 사용
+ENCODER_OVERRIDE = os.environ.get("CARDNEWS_ENCODER", "")
+
+
+def get_platform_encoder(platform):
+    """플랫폼의 기본 인코더 프로필 이름"""
+    if ENCODER_OVERRIDE in ENCODER_PROFILES:
+        return ENCODER_OVERRIDE
+    return PLATFORM_ENCODERS.get(platform, DEFAULT_ENCODER)
+
+
+def get_encoder_profile(name):
+    """인코더 프로필 (없는 이름이면 ValueError)"""
+    try:
+        return ENCODER_PROFILES[name] if name in ENCODER_PROFILES else PREVIEW_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"알 수 없는 인코더 프로필 '{name}' (사용 가능: {', '.join(ENCODER_PROFILES)})")
+
+
+@contextmanager
+def jpeg_output_buffer(size):
+    """저장하는 동안 Pillow 출력 버퍼를 size 바이트 이상으로 (동시에 저장 중인 다른 스레드와 공유)"""
+    with _jpeg_buffer_lock:
+        _jpeg_buffer_sizes.append(size)
+        ImageFile.MAXBLOCK = max(_default_maxblock, *_jpeg_buffer_sizes)
+    try:
+        yield
+    finally:
+        with _jpeg_buffer_lock:
+            _jpeg_buffer_sizes.remove(size)
+            ImageFile.MAXBLOCK = max([_default_maxblock, *_jpeg_buffer_sizes])
+
+
+def encode_image(img, profile=DEFAULT_ENCODER):
+    """이미지를 프로필 형식으로 인코딩해 (바이트, 인코딩 정보) 반환
+
+    인코딩 정보: profile, mime, extension, bytes(크기), seconds(인코딩 시간),
+    fallback(프로그레시브 JPEG 저장에 실패해 일반 JPEG로 저장했으면 "baseline", 아니면 None)
+    """
+    settings = get_encoder_profile(profile)
+    if settings['format'] == "JPEG" and img.mode != 'RGB':
+        img = img.convert('RGB')
+
+    options = settings['options']
+    whole_image = settings['format'] == "JPEG" and (options.get('progressive') or options.get('optimize'))
+    fallback = None
+
+    start = time.perf_counter()
+    buffer = io.BytesIO()
+    try:
+        if whole_image:
+            with jpeg_output_buffer(img.width * img.height * JPEG_BUFFER_BYTES_PER_PIXEL):
+                img.save(buffer, format=settings['format'], **options)
+        else:
+            img.save(buffer, format=settings['format'], **options)
+    except OSError:
+        if not whole_image:
+            raise
+        # 버퍼를 늘려도 넘치면 일반(baseline) JPEG로 다시 저장하고 인코딩 정보에 남김
+        buffer = io.BytesIO()
+        img.save(buffer, format="JPEG", **dict(options, progressive=False, optimize=False))
+        fallback = "baseline"
+    # 다른 참조가 없는 BytesIO의 getvalue()는 내부 버퍼를 그대로 넘겨주므로 복사가 생기지 않음
+    data = buffer.getvalue()
+    seconds = time.perf_counter() - start
+
+    return data, {
+        'profile': profile,
+        'mime': settings['mime'],
+        'extension': settings['extension'],
+        'bytes': len(data),
+        'seconds': seconds,
+        'fallback': fallback
+    }
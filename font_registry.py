@@ -0,0 +1,78 @@
+"""프로세스 전역 폰트 객체 캐시 (LRU)"""
+
+import threading
+from collections import OrderedDict
+
+from PIL import ImageFont
+
+
+class FontRegistry:
+    """(경로, 크기, 굵기)별 FreeTypeFont 인스턴스를 재사용하는 LRU 캐시"""
+
+    def __init__(self, max_size=64):
+        self.max_size = max_size
+        self._fonts = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, path, size, weight='regular'):
+        """캐시된 폰트 반환 (없으면 디스크에서 로드 후 저장)"""
+        key = (str(path), int(size), weight)
+
+        with self._lock:
+            font = self._fonts.get(key)
+            if font is not None:
+                self._fonts.move_to_end(key)
+                self.hits += 1
+                return font
+            self.misses += 1
+
+        # TTF 파싱은 잠금 밖에서 수행 (동시 로드 시 나중 결과는 버려짐)
+        font = ImageFont.truetype(key[0], key[1])
+        return self._store(key, font)
+
+    def preload(self, path, sizes, weight='regular'):
+        """지정한 크기들을 미리 로드 (적중/미스 통계에는 포함하지 않음)"""
+        for size in sizes:
+            key = (str(path), int(size), weight)
+            with self._lock:
+                if key in self._fonts:
+                    continue
+            self._store(key, ImageFont.truetype(key[0], key[1]))
+
+    def _store(self, key, font):
+        with self._lock:
+            existing = self._fonts.get(key)
+            if existing is not None:
+                return existing
+
+            self._fonts[key] = font
+            while len(self._fonts) > self.max_size:
+                self._fonts.popitem(last=False)
+                self.evictions += 1
+            return font
+
+    def clear(self):
+        """캐시 및 통계 초기화"""
+        with self._lock:
+            self._fonts.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """캐시 상태 (적중/미스/제거 횟수, 현재 크기)"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._fonts),
+                'max_size': self.max_size,
+                'hit_rate': self.hits / total if total else 0.0
+            }
+
+
+# 앱 전체에서 공유하는 폰트 캐시
+font_registry = FontRegistry()
@@ -0,0 +1,134 @@
+"""그라데이션 배경 렌더링 엔진 (NumPy 벡터 연산) 및 템플릿 저장소"""
+
+import os
+import threading
+from collections import OrderedDict
+
+from PIL import Image
+
+
+def smoothstep_diagonal_ratio(width, height):
+    """대각선 방향 smoothstep 비율 배열 (height x width) 계산"""
+    # numpy는 실제로 렌더링할 때 불러옴 (코어 모듈 임포트 시간 단축)
+    import numpy as np
+
+    # 기존 픽셀 루프와 동일한 연산 순서를 유지해야 결과가 1:1로 일치함
+    ratio_y = np.arange(height, dtype=np.float64) / height
+    ratio_x = np.arange(width, dtype=np.float64) / width
+    ratio = (ratio_y[:, None] + ratio_x[None, :]) / 2
+
+    # 부드러운 그라데이션
+    return ratio * ratio * (3.0 - 2.0 * ratio)
+
+
+def render_diagonal_gradient(width, height, start_color, end_color):
+    """start_color → end_color 대각선 그라데이션 이미지 생성"""
+    import numpy as np
+
+    ratio = smoothstep_diagonal_ratio(width, height)
+    pixels = np.empty((height, width, 3), dtype=np.uint8)
+
+    for channel in range(3):
+        start = start_color[channel]
+        delta = end_color[channel] - start
+        # uint8 대입 시 소수점 이하 절사 → 기존 int() 변환과 동일
+        pixels[:, :, channel] = start + delta * ratio
+
+    return Image.fromarray(pixels, 'RGB')
+
+
+class GradientTemplateStore:
+    """그라데이션 템플릿 저장소 (용량 제한 LRU)
+
+    모듈 전역 객체 하나를 프로세스 안의 모든 Streamlit 세션이 공유한다.
+    저장된 이미지는 직접 내주지 않고 사본을 반환하므로 카드에 그려도 원본은 유지된다.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._templates = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def image_bytes(img):
+        """이미지 픽셀 데이터 크기 추정"""
+        return img.width * img.height * len(img.getbands())
+
+    def _lookup(self, key):
+        img = self._templates.get(key)
+        if img is not None:
+            self._templates.move_to_end(key)
+        return img
+
+    def _insert(self, key, img):
+        size = self.image_bytes(img)
+        if size > self.max_bytes:
+            return
+
+        existing = self._templates.pop(key, None)
+        if existing is not None:
+            self.total_bytes -= self.image_bytes(existing)
+
+        self._templates[key] = img
+        self.total_bytes += size
+
+        while self.total_bytes > self.max_bytes:
+            _, evicted = self._templates.popitem(last=False)
+            self.total_bytes -= self.image_bytes(evicted)
+            self.evictions += 1
+
+    def get(self, key, factory):
+        """템플릿 사본 반환 (없으면 factory()로 만들어 저장)"""
+        with self._lock:
+            img = self._lookup(key)
+            if img is not None:
+                self.hits += 1
+                return img.copy()
+            self.misses += 1
+
+        img = factory()
+        with self._lock:
+            self._insert(key, img)
+        return img.copy()
+
+    def warm(self, key, factory):
+        """템플릿 미리 생성 (공간이 없으면 기존 항목을 밀어내지 않고 건너뜀)"""
+        with self._lock:
+            if key in self._templates:
+                return True
+
+        img = factory()
+        with self._lock:
+            if self.total_bytes + self.image_bytes(img) > self.max_bytes:
+                return False
+            self._insert(key, img)
+        return True
+
+    def clear(self):
+        """저장소 및 통계 초기화"""
+        with self._lock:
+            self._templates.clear()
+            self.total_bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """저장소 상태 (템플릿 수, 메모리 사용량, 적중/미스/제거 횟수)"""
+        with self._lock:
+            return {
+                'templates': len(self._templates),
+                'bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+
+# 앱 전체(모든 세션)에서 공유하는 그라데이션 템플릿 저장소
+gradient_templates = GradientTemplateStore(
+    int(os.environ.get("CARDNEWS_GRADIENT_CACHE_MB", "256")) * 1024 * 1024
+)
@@ -0,0 +1,84 @@
+"""배경 API 헤징(경쟁) 실행기
+
+우선순위가 높은 API가 지연 예산 안에 응답하지 않으면 다음 API를 병렬로 추가 호출하고,
+가장 먼저 도착한 유효한 결과를 사용한다. 나머지 시도는 취소 신호를 받고 결과는 버려진다.
+"""
+
+import queue
+import threading
+import time
+
+
+def race_providers(attempts, budgets=None, deadline=None, is_valid=None):
+    """헤징 방식으로 API 시도 실행
+
+    attempts: [(이름, 함수)] 우선순위 순서. 함수는 취소 이벤트를 인자로 받아 결과(실패 시 None)를 반환
+    budgets: {이름: 초} 이 시간 안에 응답이 없으면 다음 API를 추가로 호출 (없으면 끝날 때까지 대기 = 순차 실행)
+    deadline: 카드 하나에 허용하는 전체 시간(초). 넘기면 진행 중인 시도를 버리고 실패로 처리
+    반환: (성공한 이름, 결과, [(실패한 이름, 오류)])  — 모두 실패하면 이름과 결과는 None
+    """
+    budgets = budgets or {}
+    if is_valid is None:
+        is_valid = lambda result: result is not None
+
+    results = queue.Queue()
+    cancel = threading.Event()
+    errors = []
+
+    started_at = time.monotonic()
+    end_at = started_at + deadline if deadline is not None else None
+
+    launched = 0
+    finished = 0
+    next_launch_at = None
+
+    def run(index, func):
+        try:
+            results.put((index, func(cancel), None))
+        except Exception as e:
+            results.put((index, None, e))
+
+    def launch():
+        nonlocal launched, next_launch_at
+        name, func = attempts[launched]
+        # 취소된 시도가 블로킹 I/O에 묶여 있어도 프로세스 종료를 막지 않도록 데몬 스레드 사용
+        threading.Thread(target=run, args=(launched, func), name=f"hedge-{name}", daemon=True).start()
+        launched += 1
+        budget = budgets.get(name)
+        next_launch_at = time.monotonic() + budget if budget is not None else None
+
+    try:
+        while attempts:
+            now = time.monotonic()
+            if end_at is not None and now >= end_at:
+                errors.append(("deadline", TimeoutError(f"카드 전체 제한 시간 {deadline}초 초과")))
+                break
+
+            has_next = launched < len(attempts)
+            # 처음이거나 진행 중인 시도가 모두 실패했으면 즉시 다음 API 호출
+            if has_next and (launched == finished or (next_launch_at is not None and now >= next_launch_at)):
+                launch()
+                continue
+
+            # 다음 API 호출 시점이나 전체 제한 시간 중 먼저 오는 때까지 결과 대기
+            wake_times = [t for t in (next_launch_at if has_next else None, end_at) if t is not None]
+            timeout = max(0.0, min(wake_times) - now) if wake_times else None
+
+            try:
+                index, result, error = results.get(timeout=timeout)
+            except queue.Empty:
+                continue
+
+            finished += 1
+            name = attempts[index][0]
+
+            if error is None and is_valid(result):
+                return name, result, errors
+
+            errors.append((name, error or ValueError("빈 응답")))
+            if finished == len(attempts):
+                break
+
+        return None, None, errors
+    finally:
+        cancel.set()
@@ -0,0 +1,125 @@
+"""공유 HTTP 세션 (연결 재사용, 재시도/백오프, 응답 크기 제한 스트리밍 다운로드)"""
+
+import os
+import random
+import threading
+import time
+
+# 호스트당 최대 동시 연결 수
+MAX_CONNECTIONS_PER_HOST = int(os.environ.get("CARDNEWS_HTTP_MAX_PER_HOST", "8"))
+# 응답 본문 최대 크기 (이미지·폰트 모두 이 안에 들어와야 함)
+MAX_RESPONSE_BYTES = int(os.environ.get("CARDNEWS_HTTP_MAX_MB", "25")) * 1024 * 1024
+# 429/5xx·연결 실패 시 재시도 횟수와 백오프 기준 시간(초)
+MAX_RETRIES = 2
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8.0
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+CHUNK_SIZE = 64 * 1024
+
+
+class ResponseTooLarge(ValueError):
+    """응답 크기가 제한을 넘은 경우"""
+
+
+class RequestCancelled(RuntimeError):
+    """다운로드 도중 취소된 경우 (헤징 경쟁에서 진 요청 등)"""
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """프로세스 전역 requests.Session (keep-alive 연결 풀 공유)"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            # requests는 임포트가 무거워 첫 요청 때 불러옴 (코어 모듈 임포트 시간 단축)
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            # pool_block=True: 호스트당 연결 수를 넘으면 새 연결 대신 반납을 기다림
+            adapter = HTTPAdapter(
+                pool_connections=16,
+                pool_maxsize=MAX_CONNECTIONS_PER_HOST,
+                pool_block=True,
+                max_retries=0
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def backoff_delay(attempt, retry_after=None):
+    """재시도 대기 시간 (지수 백오프 + full jitter, Retry-After 우선)"""
+    if retry_after is not None:
+        try:
+            return min(BACKOFF_MAX, max(0.0, float(retry_after)))
+        except ValueError:
+            pass
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+def _read_limited(response, max_bytes, cancel):
+    length = response.headers.get("Content-Length")
+    if length is not None and length.isdigit() and int(length) > max_bytes:
+        raise ResponseTooLarge(f"응답 크기 {int(length)}바이트가 제한 {max_bytes}바이트를 초과합니다")
+
+    chunks = []
+    received = 0
+    for chunk in response.iter_content(CHUNK_SIZE):
+        if cancel is not None and cancel.is_set():
+            raise RequestCancelled("요청이 취소되었습니다")
+        received += len(chunk)
+        if received > max_bytes:
+            raise ResponseTooLarge(f"응답 크기가 제한 {max_bytes}바이트를 초과합니다")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def fetch_bytes(url, timeout=30, max_bytes=None, retries=None, cancel=None):
+    """URL 본문을 바이트로 다운로드
+
+    429/5xx 응답과 연결 실패(연결 거부·연결 시간 초과)는 지터가 섞인 백오프 후 재시도하고,
+    본문은 스트리밍으로 읽으면서 max_bytes를 넘으면 중단한다.
+    읽기 시간 초과와 본문을 읽는 도중의 오류는 재시도하지 않는다 (같은 timeout을 다시 기다리면
+    호출 측의 카드별 제한 시간을 한 API가 다 써 버려 다음 API로 넘어가지 못함).
+    cancel(threading.Event)이 설정되면 다음 청크에서 중단한다.
+    """
+    if max_bytes is None:
+        max_bytes = MAX_RESPONSE_BYTES
+    if retries is None:
+        retries = MAX_RETRIES
+
+    import requests
+
+    session = get_session()
+
+    for attempt in range(retries + 1):
+        if cancel is not None and cancel.is_set():
+            raise RequestCancelled("요청이 취소되었습니다")
+
+        try:
+            response = session.get(url, timeout=timeout, stream=True)
+        except requests.ConnectionError:
+            # ConnectTimeout도 ConnectionError의 하위 클래스 (ReadTimeout은 아님)
+            if attempt >= retries:
+                raise
+            delay = backoff_delay(attempt)
+        else:
+            with response:
+                if response.status_code in RETRY_STATUS and attempt < retries:
+                    delay = backoff_delay(attempt, response.headers.get("Retry-After"))
+                else:
+                    response.raise_for_status()
+                    return _read_limited(response, max_bytes, cancel)
+
+        # 취소되면 대기 중에도 바로 깨어남
+        if cancel is not None:
+            if cancel.wait(delay):
+                raise RequestCancelled("요청이 취소되었습니다")
+        else:
+            time.sleep(delay)
@@ -0,0 +1,135 @@
+"""배경 이미지 디스크 캐시 (콘텐츠 주소 기반, 용량 제한 LRU)
+
+재시작하거나 여러 앱 인스턴스가 같은 디렉터리를 공유해도 이미 받은 이미지를 재사용한다.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+
+def content_key(*parts):
+    """요청 구성 요소로 만든 안정적인 SHA-256 키 (프로세스마다 달라지는 hash() 대신 사용)"""
+    joined = "\x1f".join(str(part) for part in parts)
+    return hashlib.sha256(joined.encode('utf-8')).hexdigest()
+
+
+class DiskImageCache:
+    """키별 원본 응답 바이트를 파일로 보관하는 캐시"""
+
+    def __init__(self, directory, max_bytes=512 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._approx_bytes = None
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        # 한 디렉터리에 파일이 너무 많아지지 않도록 앞 2글자로 분산
+        return self.directory / key[:2] / key
+
+    def get(self, key):
+        """캐시된 바이트 반환 (없으면 None)"""
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        # LRU 판단용 사용 시각 갱신
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key, data):
+        """바이트 저장 (임시 파일에 쓴 뒤 원자적으로 교체)"""
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+        except OSError:
+            # 캐시 저장 실패는 렌더링을 막지 않음
+            return
+
+        with self._lock:
+            if self._approx_bytes is None:
+                self._approx_bytes = self._scan_size()
+            else:
+                self._approx_bytes += len(data)
+            over_limit = self._approx_bytes > self.max_bytes
+
+        if over_limit:
+            self.evict()
+
+    def _entries(self):
+        entries = []
+        if not self.directory.exists():
+            return entries
+        for path in self.directory.glob("*/*"):
+            if path.name.startswith(".tmp-"):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _scan_size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self, target_ratio=0.9):
+        """오래 사용하지 않은 파일부터 지워 용량을 max_bytes의 target_ratio 이하로 맞춤"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * target_ratio
+
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                # 다른 인스턴스가 먼저 지운 경우
+                pass
+            total -= size
+
+        with self._lock:
+            self._approx_bytes = total
+
+    def stats(self):
+        """캐시 상태 (적중/미스, 추정 용량)"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'bytes': self._approx_bytes,
+                'max_bytes': self.max_bytes
+            }
+
+
+# 앱 전체에서 공유하는 배경 캐시
+background_cache = DiskImageCache(
+    os.environ.get("CARDNEWS_CACHE_DIR", ".cache/backgrounds"),
+    int(os.environ.get("CARDNEWS_CACHE_MAX_MB", "512")) * 1024 * 1024
+)
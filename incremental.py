@@ -0,0 +1,132 @@
+"""카드별 입력 지문 기반 증분 렌더링 (입력이 바뀐 카드만 다시 그림)
+
+편집자가 본문 한 줄을 고쳐 다시 생성하면 카드 분할부터 다시 하지만, 카드마다
+레이아웃 입력(텍스트·페이지 번호·크기·폰트·인코더)과 배경 입력(키워드·카드 번호·테마·크기)의
+지문을 비교해 바뀐 카드만 렌더링하고 배경도 바뀐 것만 새로 받는다.
+배경은 축소 비율과 무관하게 원본 크기로 받아 두므로 미리보기(축소판)에서 받은 배경을
+원본 크기 내보내기에서 그대로 다시 쓴다.
+"""
+
+import threading
+
+from cardnews import (
+    background_fingerprint,
+    card_fingerprint,
+    fetch_card_backgrounds,
+    render_carousel_card
+)
+from encoders import DEFAULT_ENCODER
+from reporting import get_reporter
+
+
+class IncrementalRenderer:
+    """직전 캐러셀의 배경·렌더링 결과를 지문별로 보관하는 렌더러 (Streamlit 세션마다 하나)
+
+    보관하는 것은 축소 비율(미리보기·원본)별로 마지막으로 렌더링한 캐러셀 하나 분량뿐이다.
+    다운로드 시점의 원본 렌더링은 별도 스레드에서 돌 수 있으므로 보관소 갱신은 잠금 안에서 한다.
+    세션 간에 공유되는 캐시(AI 배경 st.cache_data, 그라데이션 템플릿, 디스크 캐시)는 그 아래 단계에서 동작한다.
+    """
+
+    def __init__(self):
+        self._backgrounds = {}
+        self._cards = {}
+        # 축소 비율 → 마지막 렌더링의 (카드 지문, 배경 지문) 집합
+        self._latest = {}
+        self._lock = threading.Lock()
+        self.last_stats = {
+            'cards': 0,
+            'cards_reused': 0,
+            'backgrounds_fetched': 0,
+            'backgrounds_reused': 0
+        }
+
+    def render(self, cards_data, background_type, theme, width, height, encoder=DEFAULT_ENCODER, style="blur", generate=None, scale=1.0):
+        """카드 순서대로 (카드 번호, 렌더링 결과, 재사용 여부)를 내주는 제너레이터
+
+        실패한 카드의 렌더링 결과는 None이다. 끝까지 돌면 이번 캐러셀에 쓰이지 않은 항목을 버린다
+        (다른 축소 비율로 마지막에 렌더링한 캐러셀은 남김).
+        generate: AI 배경 생성 함수 (fetch_card_backgrounds에 그대로 전달)
+        scale: 1.0 미만이면 미리보기용 축소판 (encoders.PREVIEW_ENCODER와 함께 사용)
+        """
+        total_cards = len(cards_data)
+        plan = []
+        for card_number, card_data in enumerate(cards_data, 1):
+            background_key = background_fingerprint(card_data, card_number, background_type, theme, width, height, style)
+            card_key = card_fingerprint(
+                card_data, card_number, total_cards, background_type, theme, width, height, encoder, background_key, scale
+            )
+            plan.append((card_number, card_data, background_key, card_key))
+
+        stats = {'cards': total_cards, 'cards_reused': 0, 'backgrounds_fetched': 0, 'backgrounds_reused': 0}
+
+        # 다시 그려야 하는 카드 중 배경이 없는 것만 병렬로 받아옴 (같은 배경을 두 스레드가 받지 않도록 잠금 안에서)
+        if background_type == "ai":
+            with self._lock:
+                needed = {}
+                for card_number, card_data, background_key, card_key in plan:
+                    if card_key not in self._cards and background_key not in needed:
+                        needed[background_key] = (card_number, card_data)
+
+                missing = {key: card for key, card in needed.items() if key not in self._backgrounds}
+                stats['backgrounds_reused'] = len(needed) - len(missing)
+
+                if missing:
+                    card_numbers = [card_number for card_number, _ in missing.values()]
+                    with get_reporter().stage(f"🎨 '{theme}' 테마 배경 {len(missing)}장을 동시에 생성 중..."):
+                        images = fetch_card_backgrounds(
+                            [card_data for _, card_data in missing.values()],
+                            theme, width, height, style,
+                            generate=generate,
+                            card_numbers=card_numbers
+                        )
+                    self._backgrounds.update(zip(missing, images))
+                    stats['backgrounds_fetched'] = len(missing)
+
+        for card_number, card_data, background_key, card_key in plan:
+            rendered = self._cards.get(card_key)
+            reused = rendered is not None
+
+            if reused:
+                stats['cards_reused'] += 1
+            else:
+                try:
+                    rendered = render_carousel_card(
+                        card_data,
+                        card_number,
+                        total_cards,
+                        background_type,
+                        theme,
+                        width,
+                        height,
+                        self._backgrounds.get(background_key),
+                        encoder,
+                        scale
+                    )
+                except Exception as e:
+                    get_reporter().error(f"❌ 카드 {card_number} 생성 오류: {e}")
+                    rendered = None
+
+                if rendered is not None:
+                    with self._lock:
+                        self._cards[card_key] = rendered
+
+            yield card_number, rendered, reused
+
+        # 세션 메모리에는 축소 비율별 마지막 캐러셀 분량만 남김
+        with self._lock:
+            self._latest[scale] = (
+                {card_key for _, _, _, card_key in plan},
+                {background_key for _, _, background_key, _ in plan}
+            )
+            card_keys = set().union(*(keys for keys, _ in self._latest.values()))
+            background_keys = set().union(*(keys for _, keys in self._latest.values()))
+            self._cards = {key: value for key, value in self._cards.items() if key in card_keys}
+            self._backgrounds = {key: value for key, value in self._backgrounds.items() if key in background_keys}
+        self.last_stats = stats
+
+    def clear(self):
+        """보관 중인 배경·카드 모두 삭제"""
+        with self._lock:
+            self._backgrounds.clear()
+            self._cards.clear()
+            self._latest.clear()
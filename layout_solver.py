@@ -0,0 +1,120 @@
+"""텍스트 블록 맞춤 레이아웃 (상자 높이에 들어가는 가장 큰 폰트 크기를 이진 탐색)
+
+크기를 바꿔 볼 때마다 단락별 줄바꿈 결과를 캐시하고, 높이는 줄 수만으로 계산하므로
+탐색 한 단계는 줄바꿈(글자 advance 테이블 재사용)만큼의 비용만 든다.
+"""
+
+import threading
+from collections import OrderedDict
+
+from text_layout import wrap_text
+
+
+class ParagraphWrapCache:
+    """(단락, 폰트 파일, 크기, 폭)별 줄바꿈 결과 LRU
+
+    폰트 객체 대신 (경로, 크기)를 키로 써서, FontRegistry에서 밀려난 폰트와
+    그 글자 advance 테이블(text_layout의 WeakKeyDictionary)이 이 캐시 때문에 남지 않게 한다.
+    """
+
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self._lines = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, paragraph, font, max_width):
+        key = (paragraph, str(font.path), font.size, max_width)
+
+        with self._lock:
+            lines = self._lines.get(key)
+            if lines is not None:
+                self._lines.move_to_end(key)
+                self.hits += 1
+                return lines
+            self.misses += 1
+
+        lines = tuple(wrap_text(paragraph, font, max_width))
+
+        with self._lock:
+            self._lines[key] = lines
+            if len(self._lines) > self.max_entries:
+                self._lines.popitem(last=False)
+        return lines
+
+    def clear(self):
+        """캐시 및 통계 초기화"""
+        with self._lock:
+            self._lines.clear()
+            self.hits = self.misses = 0
+
+
+# 앱 전체에서 공유하는 단락 줄바꿈 캐시
+wrapped_paragraphs = ParagraphWrapCache()
+
+
+def wrap_paragraph(paragraph, font, max_width):
+    """단락 하나의 줄바꿈 결과 (같은 단락·폰트 파일·크기·폭이면 재사용)"""
+    return wrapped_paragraphs.get(paragraph, font, max_width)
+
+
+def wrap_paragraphs(paragraphs, font, max_widths):
+    """단락 목록을 줄 목록으로 (빈 단락은 빈 줄 하나로 유지)"""
+    lines = []
+    for paragraph, max_width in zip(paragraphs, max_widths):
+        if paragraph.strip():
+            lines.extend(wrap_paragraph(paragraph, font, max_width))
+        else:
+            lines.append("")
+    return lines
+
+
+def block_height(lines, line_height):
+    """줄 목록의 전체 높이 (빈 줄은 줄 간격의 절반)"""
+    return sum(line_height if line else line_height // 2 for line in lines)
+
+
+def fit_text_block(paragraphs, max_widths, load_font, max_size, min_size, line_height_for, max_height):
+    """max_height 안에 들어가는 가장 큰 폰트 크기로 줄바꿈한 결과
+
+    load_font(size): 크기별 폰트, line_height_for(size): 크기별 줄 간격
+    줄 수는 폰트가 작아질수록 늘지 않으므로 이진 탐색한다. 최소 크기로도 넘치면 최소 크기를 쓴다.
+    반환: {'size', 'font', 'line_height', 'lines', 'height', 'fits', 'attempts'}
+    """
+    tried = {}
+
+    def layout(size):
+        result = tried.get(size)
+        if result is None:
+            font = load_font(size)
+            line_height = line_height_for(size)
+            lines = wrap_paragraphs(paragraphs, font, max_widths)
+            height = block_height(lines, line_height)
+            result = {
+                'size': size,
+                'font': font,
+                'line_height': line_height,
+                'lines': lines,
+                'height': height,
+                'fits': height <= max_height
+            }
+            tried[size] = result
+        return result
+
+    # 대부분은 기본 크기로 들어가므로 먼저 확인
+    best = layout(max_size)
+    if not best['fits']:
+        best = None
+        low, high = min_size, max_size - 1
+        while low <= high:
+            middle = (low + high) // 2
+            if layout(middle)['fits']:
+                best = layout(middle)
+                low = middle + 1
+            else:
+                high = middle - 1
+        if best is None:
+            best = layout(min_size)
+
+    return dict(best, attempts=len(tried))
@@ -0,0 +1,141 @@
+"""렌더링 HTTP 서비스 부하 테스트 (로컬 스텁 이미지 서버 사용, 외부 API 호출 없음)
+
+사용법:
+    python loadtest.py --jobs 40 --concurrency 16 --workers 2 --queue 8
+    python loadtest.py --url http://127.0.0.1:8080 --jobs 40   # 이미 실행 중인 서비스 대상
+
+--url 없이 실행하면 같은 프로세스에서 스텁 이미지 서버와 서비스를 띄워 측정한다.
+429를 받은 클라이언트는 Retry-After만큼 기다렸다가 다시 등록한다.
+"""
+
+import argparse
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+import cardnews
+from image_cache import DiskImageCache
+from service import RenderService, create_server
+from stub_provider import StubImageServer
+
+SAMPLE_CONTENT = (
+    "디지털 전환은 더 이상 선택이 아닌 필수입니다. 고객 경험을 중심으로 업무 방식을 바꾸고, "
+    "데이터를 기반으로 의사결정을 내리는 조직이 빠르게 성장하고 있습니다.\n\n"
+    "작은 실험을 자주 반복하고 결과를 측정하세요. 실패에서 배운 점을 팀 전체와 공유하면 "
+    "다음 시도의 성공 확률이 높아집니다.\n\n"
+    "마지막으로, 기술보다 사람이 먼저입니다. 구성원이 변화의 이유를 이해할 때 전환이 완성됩니다."
+)
+
+
+def percentile(values, ratio):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))]
+
+
+def run_client(base_url, index, args, counters, lock):
+    """작업 하나 등록 → 완료까지 폴링 → ZIP 다운로드, 소요 시간(초) 반환 (실패 시 None)"""
+    session = requests.Session()
+    job = {
+        'title': f"부하 테스트 {index}",
+        'subtitle': "렌더링 서비스",
+        'content': SAMPLE_CONTENT,
+        'platform': args.platform,
+        'background_type': args.background,
+        'max_cards': args.cards
+    }
+
+    start = time.perf_counter()
+    while True:
+        response = session.post(f"{base_url}/jobs", json=job, timeout=30)
+        if response.status_code != 429:
+            break
+        with lock:
+            counters['rejected'] += 1
+        time.sleep(float(response.headers.get("Retry-After", "1")))
+
+    if response.status_code != 202:
+        with lock:
+            counters['failed'] += 1
+        return None
+
+    job_id = response.json()['job_id']
+    while True:
+        response = session.get(f"{base_url}/jobs/{job_id}/zip", timeout=30)
+        if response.status_code != 202:
+            break
+        time.sleep(args.poll)
+
+    with lock:
+        if response.status_code == 200:
+            counters['completed'] += 1
+            counters['zip_bytes'] += len(response.content)
+        else:
+            counters['failed'] += 1
+    return time.perf_counter() - start if response.status_code == 200 else None
+
+
+def run_load(base_url, args):
+    counters = {'completed': 0, 'failed': 0, 'rejected': 0, 'zip_bytes': 0}
+    lock = threading.Lock()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        futures = [
+            executor.submit(run_client, base_url, index, args, counters, lock)
+            for index in range(1, args.jobs + 1)
+        ]
+        latencies = [latency for latency in (future.result() for future in futures) if latency is not None]
+    elapsed = time.perf_counter() - start
+
+    health = requests.get(f"{base_url}/health", timeout=10).json()
+
+    print(f"jobs={args.jobs} concurrency={args.concurrency} background={args.background} cards/job={args.cards}")
+    print(f"완료 {counters['completed']} / 실패 {counters['failed']} / 429 응답 {counters['rejected']}회")
+    print(f"총 {elapsed:.2f}s, {counters['completed'] / elapsed:.2f} jobs/s, "
+          f"ZIP 평균 {counters['zip_bytes'] / max(1, counters['completed']) / 1024:.0f} KB")
+    print(f"작업 지연 p50 {percentile(latencies, 0.5):.2f}s / p95 {percentile(latencies, 0.95):.2f}s / "
+          f"max {max(latencies, default=0):.2f}s")
+    print(f"서비스 상태: {health}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="렌더링 HTTP 서비스 부하 테스트")
+    parser.add_argument("--url", help="대상 서비스 주소 (생략하면 스텁 서버와 함께 같은 프로세스에서 실행)")
+    parser.add_argument("--jobs", type=int, default=24)
+    parser.add_argument("--concurrency", type=int, default=12, help="동시에 작업을 등록하는 클라이언트 수")
+    parser.add_argument("--workers", type=int, default=2, help="서비스 작업 스레드 수 (--url 없을 때)")
+    parser.add_argument("--queue", type=int, default=4, help="서비스 대기열 크기 (--url 없을 때)")
+    parser.add_argument("--latency", type=float, default=0.2, help="스텁 이미지 API 응답 지연(초)")
+    parser.add_argument("--background", choices=("ai", "gradient"), default="ai")
+    parser.add_argument("--platform", default="Naver Blog")
+    parser.add_argument("--cards", type=int, default=4)
+    parser.add_argument("--poll", type=float, default=0.2, help="ZIP 폴링 간격(초)")
+    args = parser.parse_args()
+
+    if args.url:
+        run_load(args.url.rstrip('/'), args)
+        return
+
+    with StubImageServer(latency=args.latency) as stub:
+        cardnews.PROVIDER_BASE_URLS.update(stub.provider_urls())
+        # 이전 실행의 다운로드가 섞이지 않도록 빈 디스크 캐시 사용
+        cardnews.background_cache = DiskImageCache(tempfile.mkdtemp(prefix="cardnews-load-"))
+
+        service = RenderService(args.workers, args.queue).start()
+        server = create_server(service, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            run_load(f"http://127.0.0.1:{server.server_address[1]}", args)
+        finally:
+            server.shutdown()
+            server.server_close()
+            service.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""카드 텍스트·패널 레이어 (RGBA) 저장소와 배경 합성
+
+페이지 번호·제목·부제목·본문 패널은 배경과 무관하므로 투명 RGBA 레이어에 따로 그려 두고,
+마지막에 배경 위에 알파 합성한다. 테마나 배경만 바뀌면 레이어를 그대로 다시 쓴다.
+레이어는 내용이 있는 영역만 잘라 (이미지, 위치)로 보관한다.
+"""
+
+import os
+from collections import namedtuple
+
+from gradient import GradientTemplateStore
+
+# image: 잘라 낸 RGBA 레이어, offset: 카드 좌상단 기준 붙일 위치
+TextLayer = namedtuple('TextLayer', ['image', 'offset'])
+
+
+class TextLayerStore(GradientTemplateStore):
+    """텍스트 레이어 저장소 (그라데이션 템플릿과 같은 용량 제한 LRU)
+
+    합성은 배경 쪽에만 쓰므로 템플릿과 달리 사본을 만들지 않고 저장된 레이어를 그대로 내준다.
+    """
+
+    @staticmethod
+    def image_bytes(layer):
+        return GradientTemplateStore.image_bytes(layer.image)
+
+    def get(self, key, factory):
+        """레이어 반환 (없으면 factory()로 만들어 저장, None이면 저장하지 않음)"""
+        with self._lock:
+            layer = self._lookup(key)
+            if layer is not None:
+                self.hits += 1
+                return layer
+            self.misses += 1
+
+        layer = factory()
+        if layer is not None:
+            with self._lock:
+                self._insert(key, layer)
+        return layer
+
+
+def crop_layer(img):
+    """투명한 가장자리를 잘라 TextLayer로 변환 (그린 것이 없으면 None)"""
+    bbox = img.getbbox()
+    if bbox is None:
+        return None
+    return TextLayer(img.crop(bbox), bbox[:2])
+
+
+def composite_text_layer(background, layer):
+    """배경(RGB) 위에 텍스트 레이어를 알파 합성 (배경 이미지를 직접 수정해 반환)"""
+    background.paste(layer.image, layer.offset, layer.image)
+    return background
+
+
+# 앱 전체(모든 세션)에서 공유하는 텍스트 레이어 저장소
+text_layers = TextLayerStore(
+    int(os.environ.get("CARDNEWS_TEXT_LAYER_CACHE_MB", "128")) * 1024 * 1024
+)
@@ -0,0 +1,114 @@
+"""배경 후처리 파이프라인 (밝기/대비/채도 조정을 LUT·행렬 한 번으로 합침)
+
+ImageEnhance는 조정마다 기준 이미지와 결과 이미지를 새로 만든다.
+여기서는 같은 연산을 채널별 LUT(밝기·대비)와 색 변환 행렬(채도)로 바꿔
+카드 한 장을 한두 번의 전체 이미지 처리로 끝낸다.
+"""
+
+from functools import lru_cache
+
+from PIL import ImageFilter, ImageStat
+
+
+@lru_cache(maxsize=1)
+def identity_lut():
+    """항등 LUT (numpy는 처음 쓸 때 불러옴)"""
+    import numpy as np
+    lut = np.arange(256, dtype=np.uint8)
+    lut.flags.writeable = False
+    return lut
+
+
+def blend_lut(base, factor):
+    """Image.blend(단색 base, 원본, factor)와 같은 값을 내는 LUT
+
+    Pillow의 blend는 float32로 계산 후 소수점 이하를 버리므로 같은 방식으로 계산한다.
+    """
+    import numpy as np
+    values = np.arange(256, dtype=np.float32)
+    out = np.float32(base) + np.float32(factor) * (values - np.float32(base))
+    return np.clip(np.trunc(out), 0, 255).astype(np.uint8)
+
+
+def brightness_lut(factor):
+    """ImageEnhance.Brightness와 같은 LUT"""
+    return blend_lut(0, factor)
+
+
+def contrast_lut(img, factor):
+    """ImageEnhance.Contrast와 같은 LUT (기준값은 흑백 변환 이미지의 평균 밝기)"""
+    mean = int(ImageStat.Stat(img.convert('L')).mean[0] + 0.5)
+    return blend_lut(mean, factor)
+
+
+def compose_luts(*luts):
+    """앞에서부터 차례로 적용한 것과 같은 LUT 하나로 합성 (단계별 반올림·클리핑 유지)"""
+    result = identity_lut()
+    for lut in luts:
+        result = lut[result]
+    return result
+
+
+def apply_lut(img, lut):
+    """RGB 세 채널에 같은 LUT 적용 (항등 LUT면 그대로 반환)"""
+    if lut is identity_lut() or (lut == identity_lut()).all():
+        return img
+    return img.point(lut.tolist() * 3)
+
+
+def color_matrix(factor):
+    """ImageEnhance.Color와 같은 색 변환 행렬 (흑백 ↔ 원본 보간)"""
+    gray = 1 - factor
+    r, g, b = 0.299 * gray, 0.587 * gray, 0.114 * gray
+    return (
+        factor + r, g, b, 0,
+        r, factor + g, b, 0,
+        r, g, factor + b, 0
+    )
+
+
+def sharpen_kernel(factor):
+    """ImageEnhance.Sharpness와 같은 3x3 커널 (SMOOTH 결과와의 보간을 커널 하나로 합침)"""
+    smooth = [1, 1, 1, 1, 5, 1, 1, 1, 1]
+    weights = [-(factor - 1) * w / 13 for w in smooth]
+    weights[4] += factor
+    return ImageFilter.Kernel((3, 3), weights, scale=1)
+
+
+def apply_fused_effects(img, style, scale=1.0, brightness=1.0):
+    """스타일 효과 + 밝기 조정을 최소한의 전체 이미지 처리로 적용
+
+    scale: 최종 크기 대비 현재 이미지 비율 (블러 반경 보정용)
+    brightness: 효과 뒤에 이어서 적용할 밝기 배율 (1.0이면 생략)
+    """
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+
+    darken = brightness_lut(brightness) if brightness != 1.0 else identity_lut()
+
+    if style == "blur":
+        img = img.filter(ImageFilter.GaussianBlur(radius=12 * scale))
+        return apply_lut(img, darken)
+
+    if style == "dark":
+        return apply_lut(img, compose_luts(brightness_lut(0.4), darken))
+
+    if style == "vintage":
+        # 채도 행렬 → (대비 + 밝기) LUT
+        img = img.convert('RGB', color_matrix(0.8))
+        return apply_lut(img, compose_luts(contrast_lut(img, 1.1), darken))
+
+    if style == "modern":
+        # 대비 LUT → 샤픈 커널 → 밝기 LUT (샤픈 결과가 255를 넘는 부분은 먼저 잘라야 기존과 같음)
+        img = apply_lut(img, contrast_lut(img, 1.2))
+        img = img.filter(sharpen_kernel(1.1))
+        return apply_lut(img, darken)
+
+    return apply_lut(img, darken)
+
+
+def darken_image(img, factor):
+    """밝기 배율 적용 (LUT 한 번)"""
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+    return apply_lut(img, brightness_lut(factor))
@@ -0,0 +1,83 @@
+"""렌더링 진행/이벤트 보고 인터페이스
+
+렌더링 코어(cardnews)는 화면 출력 방법을 모르고 현재 등록된 Reporter에 이벤트만 보낸다.
+기본값은 아무것도 하지 않는 NullReporter이며, Streamlit 앱·배치 CLI 등 소비자가
+필요한 Reporter를 set_reporter()로 등록한다.
+"""
+
+import logging
+from contextlib import contextmanager
+
+
+class NullReporter:
+    """아무것도 하지 않는 기본 Reporter (작업 프로세스·테스트·서버용)"""
+
+    @contextmanager
+    def stage(self, message):
+        """오래 걸리는 단계 (Streamlit에서는 스피너로 표시)"""
+        yield
+
+    def progress(self, done, total, message=""):
+        """단계 내 진행률"""
+
+    def info(self, message):
+        pass
+
+    def success(self, message):
+        pass
+
+    def warning(self, message):
+        pass
+
+    def error(self, message):
+        pass
+
+    def capture_context(self):
+        """작업 스레드로 넘길 호출 측 실행 컨텍스트 (없으면 None)"""
+        return None
+
+    def attach_context(self, ctx):
+        """작업 스레드에 실행 컨텍스트 연결"""
+
+
+class LoggingReporter(NullReporter):
+    """이벤트를 logging으로 남기는 Reporter (배치 CLI 등)"""
+
+    def __init__(self, logger=None):
+        self.logger = logger or logging.getLogger("cardnews")
+
+    @contextmanager
+    def stage(self, message):
+        self.logger.info(message)
+        yield
+
+    def progress(self, done, total, message=""):
+        self.logger.debug(f"{message} {done}/{total}".strip())
+
+    def info(self, message):
+        self.logger.info(message)
+
+    def success(self, message):
+        self.logger.info(message)
+
+    def warning(self, message):
+        self.logger.warning(message)
+
+    def error(self, message):
+        self.logger.error(message)
+
+
+_reporter = NullReporter()
+
+
+def get_reporter():
+    """현재 등록된 Reporter"""
+    return _reporter
+
+
+def set_reporter(reporter):
+    """Reporter 등록 (None이면 NullReporter로 되돌림), 이전 Reporter 반환"""
+    global _reporter
+    previous = _reporter
+    _reporter = reporter if reporter is not None else NullReporter()
+    return previous
@@ -0,0 +1,444 @@
+"""카드뉴스 렌더링 HTTP 서비스 (표준 라이브러리만 사용, Streamlit 없이 실행)
+
+사용법:
+    python service.py --port 8080 [--workers 2] [--queue 16]
+
+API:
+    POST /jobs                  작업 등록 (JSON: title, subtitle, content, platform, theme,
+                                background_type, max_cards, encoder, width/height) → 202 {job_id, ...}
+                                대기열이 가득 차면 429 + Retry-After
+    GET  /jobs/<id>             작업 상태 (queued / running / done / error, 완료된 카드 수)
+    GET  /jobs/<id>/zip         완료된 작업의 ZIP (아직이면 202, 실패했으면 500)
+    GET  /jobs/<id>/cards       카드 이미지를 완성되는 대로 multipart/mixed로 스트리밍
+    GET  /jobs/<id>/cards/<n>   n번째 카드 이미지 (완성될 때까지 대기)
+    GET  /jobs/<id>/trace       작업의 단계별 시간 추적 (JSON, 진행 중이면 지금까지의 기록)
+    GET  /health                대기열 길이·작업 스레드 수 등 상태
+    GET  /metrics               단계별 소요 시간 히스토그램·횟수 (Prometheus 텍스트 형식)
+"""
+
+import argparse
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote, urlsplit
+
+from batch import iter_job_cards, normalize_job
+from archive import CarouselArchive
+from reporting import LoggingReporter, set_reporter
+from tracing import stage_metrics, trace_job
+from warmup import describe, warm_up
+
+# 동시에 렌더링할 작업 수 (작업 스레드 수)
+SERVICE_WORKERS = int(os.environ.get("CARDNEWS_SERVICE_WORKERS", "2"))
+# 대기열에 쌓아 둘 수 있는 작업 수 (넘으면 429)
+SERVICE_QUEUE_SIZE = int(os.environ.get("CARDNEWS_SERVICE_QUEUE", "16"))
+# 결과를 보관할 완료 작업 수 (넘으면 오래된 것부터 삭제)
+SERVICE_MAX_FINISHED_JOBS = int(os.environ.get("CARDNEWS_SERVICE_MAX_JOBS", "64"))
+# 429 응답 시 클라이언트에 권장할 재시도 대기(초)
+RETRY_AFTER_SECONDS = 2
+# 카드 하나를 기다리는 최대 시간(초)
+CARD_WAIT_TIMEOUT = 300
+MAX_REQUEST_BYTES = 1024 * 1024
+
+logger = logging.getLogger("service")
+
+
+class QueueFull(RuntimeError):
+    """대기열이 가득 차 작업을 받을 수 없는 경우"""
+
+
+class RenderJob:
+    """대기열에 들어간 작업 하나의 상태와 렌더링 결과"""
+
+    def __init__(self, spec):
+        self.id = uuid.uuid4().hex
+        self.spec = spec
+        self.status = "queued"
+        self.total = None
+        self.cards = []
+        self.archive = None
+        self.error = None
+        self.trace = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self._changed = threading.Condition()
+
+    def run(self):
+        """카드를 렌더링하면서 완성된 카드를 바로 공개 (작업 스레드에서 호출)"""
+        with self._changed:
+            self.status = "running"
+            self.started = time.time()
+
+        archive = CarouselArchive()
+        try:
+            with trace_job(self.id) as trace:
+                self.trace = trace
+                self._render(archive)
+            with self._changed:
+                self.archive = archive
+                self.status = "done"
+        except Exception as e:
+            archive.discard()
+            with self._changed:
+                self.error = f"{type(e).__name__}: {e}"
+                self.status = "error"
+        finally:
+            with self._changed:
+                self.finished = time.time()
+                self._changed.notify_all()
+
+    def _render(self, archive):
+        """카드를 렌더링되는 대로 공개하고 ZIP에 추가"""
+        total, cards = iter_job_cards(self.spec)
+        with self._changed:
+            self.total = total
+            self._changed.notify_all()
+
+        for rendered in cards:
+            archive.add(rendered)
+            with self._changed:
+                self.cards.append(rendered)
+                self._changed.notify_all()
+
+        archive.close()
+
+    def wait_card(self, index, timeout=CARD_WAIT_TIMEOUT):
+        """index번째(0부터) 카드가 완성될 때까지 대기 (없는 카드·실패·시간 초과면 None)"""
+        deadline = time.monotonic() + timeout
+        with self._changed:
+            while True:
+                if index < len(self.cards):
+                    return self.cards[index]
+                if self.finished is not None or (self.total is not None and index >= self.total):
+                    return None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._changed.wait(remaining)
+
+    def snapshot(self):
+        """상태 응답용 요약"""
+        with self._changed:
+            return {
+                'job_id': self.id,
+                'status': self.status,
+                'cards_done': len(self.cards),
+                'cards_total': self.total,
+                'encoding': [
+                    {
+                        'card_number': rendered['card_number'],
+                        'profile': rendered['encoding']['profile'],
+                        'bytes': rendered['encoding']['bytes'],
+                        'encode_ms': round(rendered['encoding']['seconds'] * 1000, 1)
+                    }
+                    for rendered in self.cards
+                ],
+                'error': self.error,
+                'queued_seconds': round((self.started or time.time()) - self.created, 3),
+                'render_seconds': round((self.finished or time.time()) - self.started, 3) if self.started else None
+            }
+
+
+class RenderService:
+    """크기가 정해진 대기열 + 작업 스레드 풀
+
+    대기열이 가득 차면 submit()이 QueueFull을 던지고, HTTP 계층은 이를 429로 돌려준다.
+    """
+
+    def __init__(self, workers=None, queue_size=None, max_finished_jobs=None):
+        self.workers = workers or SERVICE_WORKERS
+        self.max_finished_jobs = max_finished_jobs or SERVICE_MAX_FINISHED_JOBS
+        self._queue = queue.Queue(maxsize=queue_size or SERVICE_QUEUE_SIZE)
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._threads = []
+        self.accepted = 0
+        self.rejected = 0
+
+    def start(self):
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"render-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        """대기열에 남은 작업까지 처리한 뒤 작업 스레드 종료"""
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            try:
+                job.run()
+                logger.info(f"{job.id}: {job.status} ({len(job.cards)}장)")
+            finally:
+                self._queue.task_done()
+                self._prune()
+
+    def _prune(self):
+        # 완료된 작업 결과는 최근 것만 보관 (카드 이미지·ZIP이 메모리에 남으므로)
+        with self._lock:
+            finished = [job_id for job_id, job in self._jobs.items() if job.finished is not None]
+            for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+                del self._jobs[job_id]
+
+    def submit(self, spec):
+        """작업 등록 (대기열이 가득 차면 QueueFull)"""
+        job = RenderJob(spec)
+        with self._lock:
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                self.rejected += 1
+                raise QueueFull("대기열이 가득 찼습니다")
+            self._jobs[job.id] = job
+            self.accepted += 1
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self):
+        """서비스 상태 (대기열 길이, 보관 중인 작업 수, 수락/거절 횟수)"""
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+            return {
+                'workers': self.workers,
+                'queue_depth': self._queue.qsize(),
+                'queue_size': self._queue.maxsize,
+                'running': statuses.count("running"),
+                'jobs': len(statuses),
+                'accepted': self.accepted,
+                'rejected': self.rejected
+            }
+
+
+def content_disposition(filename):
+    """한글 파일 이름도 전달되는 Content-Disposition 값 (RFC 5987, ASCII 대체 이름 포함)"""
+    fallback = re.sub(r'[^\w.-]', '_', filename.encode('ascii', 'ignore').decode('ascii')) or "card.png"
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename)}"
+
+
+JOB_PATH = re.compile(r'^/jobs/([0-9a-f]{32})(?:/(zip|cards|trace)(?:/(\d+))?)?/?$')
+CONTENT_LENGTH = re.compile(r'[0-9]+')
+
+
+def make_handler(service):
+    """RenderService에 연결된 요청 처리기 클래스"""
+
+    class Handler(BaseHTTPRequestHandler):
+        # 카드 스트리밍에 chunked 전송을 쓰기 위해 HTTP/1.1
+        protocol_version = "HTTP/1.1"
+
+        def _send_body(self, status, body, content_type, headers=None):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _send_json(self, status, payload, headers=None):
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self._send_body(status, body, "application/json; charset=utf-8", headers)
+
+        def _send_chunk(self, data):
+            self.wfile.write(f"{len(data):X}\r\n".encode('ascii'))
+            self.wfile.write(data)
+            self.wfile.write(b"\r\n")
+
+        def do_POST(self):
+            if urlsplit(self.path).path.rstrip('/') != "/jobs":
+                self._send_json(404, {'error': "not found"})
+                return
+
+            length_header = self.headers.get("Content-Length")
+            if length_header is None:
+                self._send_json(411, {'error': "Content-Length required"})
+                self.close_connection = True
+                return
+
+            length = None
+            try:
+                # 음수·숫자가 아닌 값은 본문을 읽기 전에 거절 (rfile.read(-1)은 연결이 닫힐 때까지 막힘)
+                if not CONTENT_LENGTH.fullmatch(length_header.strip()):
+                    raise ValueError(f"Content-Length가 올바르지 않습니다: {length_header!r}")
+                length = int(length_header)
+                if length > MAX_REQUEST_BYTES:
+                    self._send_json(413, {'error': "request too large"})
+                    self.close_connection = True
+                    return
+                row = json.loads(self.rfile.read(length) or b"{}")
+                if not isinstance(row, dict):
+                    raise ValueError("작업은 JSON 객체여야 합니다")
+                spec = normalize_job(row, 1)
+                if not spec['title']:
+                    raise ValueError("메인 제목(title)이 비어 있습니다")
+            except (ValueError, TypeError) as e:
+                self._send_json(400, {'error': str(e)})
+                # 본문 길이를 알 수 없으면 남은 본문이 다음 요청으로 읽히지 않도록 연결 종료
+                if length is None:
+                    self.close_connection = True
+                return
+
+            try:
+                job = service.submit(spec)
+            except QueueFull as e:
+                self._send_json(429, {'error': str(e)}, {"Retry-After": str(RETRY_AFTER_SECONDS)})
+                return
+
+            self._send_json(202, {
+                'job_id': job.id,
+                'status_url': f"/jobs/{job.id}",
+                'zip_url': f"/jobs/{job.id}/zip",
+                'cards_url': f"/jobs/{job.id}/cards"
+            }, {"Location": f"/jobs/{job.id}"})
+
+        def do_GET(self):
+            # 쿼리 문자열은 무시 (/jobs/<id>?x=1도 같은 작업)
+            path = urlsplit(self.path).path
+            if path.rstrip('/') == "/health":
+                self._send_json(200, service.stats())
+                return
+            if path.rstrip('/') == "/metrics":
+                body = stage_metrics.prometheus_text().encode('utf-8')
+                self._send_body(200, body, "text/plain; version=0.0.4; charset=utf-8")
+                return
+
+            match = JOB_PATH.match(path)
+            job = service.get(match.group(1)) if match else None
+            if job is None:
+                self._send_json(404, {'error': "not found"})
+                return
+
+            resource, card_number = match.group(2), match.group(3)
+            if resource is None:
+                self._send_json(200, job.snapshot())
+            elif resource == "zip":
+                self._send_zip(job)
+            elif resource == "trace":
+                if job.trace is None:
+                    self._send_json(202, job.snapshot(), {"Retry-After": "1"})
+                else:
+                    self._send_json(200, job.trace.to_dict())
+            elif card_number is not None:
+                self._send_card(job, int(card_number))
+            else:
+                self._stream_cards(job)
+
+        def _send_zip(self, job):
+            snapshot = job.snapshot()
+            if snapshot['status'] == "error":
+                self._send_json(500, snapshot)
+            elif snapshot['status'] != "done":
+                self._send_json(202, snapshot, {"Retry-After": "1"})
+            else:
+                # ZIP 전체를 bytes로 복사하지 않고 청크 단위로 전송 (임시 파일로 옮겨진 경우 포함)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/zip")
+                self.send_header("Content-Length", str(job.archive.size))
+                self.send_header("Content-Disposition", content_disposition(f"carousel_{job.id}.zip"))
+                self.end_headers()
+                for chunk in job.archive.iter_chunks():
+                    self.wfile.write(chunk)
+
+        def _send_card(self, job, card_number):
+            rendered = job.wait_card(card_number - 1) if card_number >= 1 else None
+            if rendered is None:
+                snapshot = job.snapshot()
+                self._send_json(500 if snapshot['status'] == "error" else 404, snapshot)
+                return
+            self._send_body(200, rendered['image_bytes'], rendered['mime'], {
+                "Content-Disposition": content_disposition(rendered['filename'])
+            })
+
+        def _stream_cards(self, job):
+            boundary = uuid.uuid4().hex
+            self.send_response(200)
+            self.send_header("Content-Type", f"multipart/mixed; boundary={boundary}")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+
+            try:
+                index = 0
+                while True:
+                    rendered = job.wait_card(index)
+                    if rendered is None:
+                        break
+                    header = (
+                        f"--{boundary}\r\n"
+                        f"Content-Type: {rendered['mime']}\r\n"
+                        f"Content-Disposition: {content_disposition(rendered['filename'])}\r\n"
+                        f"Content-Length: {len(rendered['image_bytes'])}\r\n\r\n"
+                    ).encode('utf-8')
+                    self._send_chunk(header)
+                    self._send_chunk(rendered['image_bytes'])
+                    self._send_chunk(b"\r\n")
+                    self.wfile.flush()
+                    index += 1
+
+                self._send_chunk(f"--{boundary}--\r\n".encode('ascii'))
+                self._send_chunk(b"")
+            except (BrokenPipeError, ConnectionResetError):
+                # 클라이언트가 스트리밍 도중 연결을 끊은 경우
+                self.close_connection = True
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    return Handler
+
+
+def create_server(service, host="127.0.0.1", port=8080):
+    """서비스용 HTTP 서버 생성 (serve_forever()는 호출 측에서)"""
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="카드뉴스 렌더링 HTTP 서비스")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=SERVICE_WORKERS, help="동시에 렌더링할 작업 수")
+    parser.add_argument("--queue", type=int, default=SERVICE_QUEUE_SIZE, help="대기열 크기 (넘으면 429)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="작업별 처리 결과 출력")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format="%(message)s")
+    set_reporter(LoggingReporter())
+
+    # 첫 요청이 폰트 설치·캐시 준비를 떠안지 않도록 시작 전에 준비
+    readiness = warm_up()
+    print(describe(readiness))
+
+    service = RenderService(args.workers, args.queue).start()
+    server = create_server(service, args.host, args.port)
+    print(f"http://{args.host}:{server.server_address[1]} (작업 스레드 {service.workers}, 대기열 {args.queue})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""로컬 이미지 API 스텁 서버 (네트워크 없이 배경 생성 경로를 시험/측정할 때 사용)
+
+    with StubImageServer(latency=0.5) as server:
+        PROVIDER_BASE_URLS.update(server.provider_urls())
+        ...
+"""
+
+import io
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from PIL import Image
+
+
+def parse_requested_size(url, default=(64, 64)):
+    """API URL에서 요청 크기 추출 (?width=&height=, /W/H, /WxH/ 형식)"""
+    parsed = urlparse(url)
+    query = parse_qs(parsed.query)
+    if 'width' in query and 'height' in query:
+        return int(query['width'][0]), int(query['height'][0])
+
+    match = re.search(r'/(\d+)x(\d+)(?:/|$)', parsed.path)
+    if match:
+        return int(match.group(1)), int(match.group(2))
+
+    numbers = re.findall(r'/(\d+)', parsed.path)
+    if len(numbers) >= 2:
+        return int(numbers[-2]), int(numbers[-1])
+
+    return default
+
+
+class StubImageServer:
+    """지연 시간을 인위적으로 더하는 JPEG 응답 서버
+
+    latency: 모든 요청에 적용할 지연(초) 또는 {경로 접두사: 지연} 딕셔너리
+    status: {경로 접두사: HTTP 상태 코드} (실패하는 API 흉내)
+    """
+
+    def __init__(self, latency=0.0, status=None, host="127.0.0.1", port=0):
+        self.latency = latency
+        self.status = status or {}
+        self.requests = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def provider_urls(self):
+        """PROVIDER_BASE_URLS에 덮어쓸 스텁 주소"""
+        return {
+            "pollinations": f"{self.base_url}/prompt/",
+            "picsum": f"{self.base_url}/picsum",
+            "unsplash": f"{self.base_url}/unsplash"
+        }
+
+    def _lookup(self, table, path, default):
+        if not isinstance(table, dict):
+            return table
+        for prefix, value in table.items():
+            if path.startswith(prefix):
+                return value
+        return default
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with server._lock:
+                    server.requests.append(self.path)
+
+                time.sleep(server._lookup(server.latency, self.path, 0.0))
+
+                status = server._lookup(server.status, self.path, 200)
+                if status != 200:
+                    self.send_error(status)
+                    return
+
+                width, height = parse_requested_size(self.path)
+                buffer = io.BytesIO()
+                # 요청 경로마다 다른 단색 (결과 순서 검증용)
+                color = tuple(zlib.crc32(self.path.encode()).to_bytes(4, 'big')[:3])
+                Image.new('RGB', (width, height), color).save(buffer, format='JPEG', quality=80)
+                body = buffer.getvalue()
+
+                try:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "image/jpeg")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # 클라이언트가 먼저 끊은 경우 (요청 경쟁에서 진 쪽)
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
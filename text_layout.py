@@ -0,0 +1,124 @@
+"""글자 advance 테이블 기반 증분 줄바꿈 엔진"""
+
+import threading
+import weakref
+
+
+class GlyphAdvanceTable:
+    """폰트별 글자 advance/커닝/잉크 돌출량 캐시"""
+
+    # 커닝 쌍 캐시 상한 (한글 조합이 많아 무한정 늘어나지 않도록)
+    MAX_KERNING_PAIRS = 50000
+
+    def __init__(self, font):
+        # 약한 참조 (테이블이 폰트를 붙잡으면 WeakKeyDictionary 항목이 영영 사라지지 않음)
+        self.font = weakref.proxy(font)
+        self._advances = {}
+        self._overhangs = {}
+        self._kerning = {}
+
+    def advance(self, char):
+        """글자 하나의 advance 폭"""
+        width = self._advances.get(char)
+        if width is None:
+            width = self.font.getlength(char)
+            self._advances[char] = width
+        return width
+
+    def kerning(self, prev_char, char):
+        """두 글자 사이 커닝 보정값"""
+        pair = prev_char + char
+        value = self._kerning.get(pair)
+        if value is None:
+            value = self.font.getlength(pair) - self.advance(prev_char) - self.advance(char)
+            if len(self._kerning) >= self.MAX_KERNING_PAIRS:
+                self._kerning.clear()
+            self._kerning[pair] = value
+        return value
+
+    def overhang(self, char):
+        """잉크 영역이 advance 기준선에서 벗어나는 최대 폭 (측정 오차 상한 계산용)"""
+        value = self._overhangs.get(char)
+        if value is None:
+            left, _, right, _ = self.font.getbbox(char)
+            value = max(abs(left), abs(right - self.advance(char)))
+            self._overhangs[char] = value
+        return value
+
+    def measure(self, text):
+        """텍스트의 실제 잉크 폭 (ImageDraw.textbbox와 동일한 값)"""
+        left, _, right, _ = self.font.getbbox(text)
+        return right - left
+
+
+_tables = weakref.WeakKeyDictionary()
+_tables_lock = threading.Lock()
+
+
+def get_glyph_table(font):
+    """폰트 객체에 연결된 advance 테이블 반환 (폰트가 해제되면 함께 해제)"""
+    with _tables_lock:
+        table = _tables.get(font)
+        if table is None:
+            table = GlyphAdvanceTable(font)
+            _tables[font] = table
+        return table
+
+
+def wrap_text(text, font, max_width):
+    """글자 단위 줄바꿈 (누적 advance로 판단, 경계 근처에서만 실측)
+
+    매 글자마다 줄 전체를 다시 측정하던 방식과 같은 위치에서 줄을 나눈다.
+    누적 advance 추정치와 실제 잉크 폭의 차이는 글자별 돌출량으로 제한되므로,
+    추정치가 max_width에서 그 오차 범위 안에 있을 때만 실제 폭을 측정한다.
+    """
+    if not text:
+        return []
+
+    table = get_glyph_table(font)
+    lines = []
+
+    line_start = 0       # 현재 줄이 시작하는 인덱스
+    line_length = 0.0    # 현재 줄의 누적 advance (커닝 포함)
+    line_overhang = 0    # 현재 줄 글자들의 최대 돌출량
+    prev_char = None
+
+    for index, char in enumerate(text):
+        test_length = line_length + table.advance(char)
+        if prev_char is not None:
+            test_length += table.kerning(prev_char, char)
+
+        test_overhang = max(line_overhang, table.overhang(char))
+        # 첫 글자 왼쪽 + 마지막 글자 오른쪽 돌출, 픽셀 반올림 여유
+        slack = test_overhang * 2 + 2
+
+        if test_length + slack <= max_width:
+            fits = True
+        elif test_length - slack > max_width:
+            fits = False
+        else:
+            fits = table.measure(text[line_start:index + 1]) <= max_width
+
+        if fits:
+            line_length = test_length
+            line_overhang = test_overhang
+            prev_char = char
+        elif index > line_start:
+            lines.append(text[line_start:index])
+            line_start = index
+            line_length = table.advance(char)
+            line_overhang = table.overhang(char)
+            prev_char = char
+        else:
+            # 한 글자도 들어가지 않는 경우 (거의 없겠지만)
+            lines.append(char)
+            line_start = index + 1
+            line_length = 0.0
+            line_overhang = 0
+            prev_char = None
+
+    if line_start < len(text):
+        lines.append(text[line_start:])
+
+    # 빈 라인 제거
+    return [line for line in lines if line.strip()]
@@ -0,0 +1,77 @@
+"""텍스트 크기 측정 서비스 (스레드별 측정 컨텍스트 + bbox 캐시)"""
+
+import threading
+from collections import OrderedDict
+
+from PIL import Image, ImageDraw
+
+
+class TextMetrics:
+    """(텍스트, 폰트)별 bbox를 LRU로 보관하고 측정용 Draw를 스레드마다 하나만 생성"""
+
+    def __init__(self, max_entries=8192):
+        self.max_entries = max_entries
+        self._bboxes = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+
+    def _draw(self):
+        draw = getattr(self._local, 'draw', None)
+        if draw is None:
+            # 기존과 같은 RGB 1x1 캔버스 (fontmode가 같아야 bbox가 동일)
+            draw = ImageDraw.Draw(Image.new('RGB', (1, 1)))
+            self._local.draw = draw
+        return draw
+
+    def textbbox(self, text, font):
+        """(0, 0) 기준 텍스트 bbox"""
+        # 폰트 객체 대신 (파일, 크기)를 키로 사용 (id() 재사용 충돌 방지, FontRegistry에서 밀려난 폰트를 붙잡지 않음)
+        key = (text, str(font.path), font.size)
+
+        with self._lock:
+            bbox = self._bboxes.get(key)
+            if bbox is not None:
+                self._bboxes.move_to_end(key)
+                self.hits += 1
+                return bbox
+            self.misses += 1
+
+        bbox = self._draw().textbbox((0, 0), text, font=font)
+
+        with self._lock:
+            self._bboxes[key] = bbox
+            if len(self._bboxes) > self.max_entries:
+                self._bboxes.popitem(last=False)
+        return bbox
+
+    def dimensions(self, text, font):
+        """텍스트의 (너비, 높이)"""
+        bbox = self.textbbox(text, font)
+        return bbox[2] - bbox[0], bbox[3] - bbox[1]
+
+    def clear(self):
+        """캐시 및 통계 초기화"""
+        with self._lock:
+            self._bboxes.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        """캐시 상태 (적중/미스 횟수, 현재 크기)"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._bboxes),
+                'max_entries': self.max_entries
+            }
+
+
+# 앱 전체에서 공유하는 측정 서비스
+text_metrics = TextMetrics()
+
+
+def get_text_dimensions(text, font):
+    """텍스트의 정확한 크기 측정"""
+    return text_metrics.dimensions(text, font)
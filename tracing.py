@@ -0,0 +1,239 @@
+"""렌더링 단계별 시간 측정 (span → 작업별 JSON 추적 + Prometheus 텍스트 지표)
+
+span 하나는 perf_counter 두 번과 잠금 한 번 정도의 비용이라 항상 켜 둔다.
+프로세스 전역 지표(stage_metrics)에는 모든 span이 누적되고, trace_job() 안에서 실행된
+span은 그 작업의 추적(Trace)에도 기록된다. 작업 스레드에는 capture_trace()/use_trace()로 넘긴다.
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# 히스토그램 버킷 상한(초)
+STAGE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# 작업 하나의 추적에 기록할 최대 span 수 (넘으면 지표에만 누적)
+MAX_TRACE_SPANS = int(os.environ.get("CARDNEWS_TRACE_MAX_SPANS", "5000"))
+
+METRIC_PREFIX = "cardnews"
+
+
+def escape_label_value(value):
+    """Prometheus 레이블 값 이스케이프 (역슬래시, 큰따옴표, 줄바꿈)"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(labels):
+    """Prometheus 레이블 문자열 ({a="1",b="2"})"""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label_value(value)}"' for name, value in labels) + "}"
+
+
+class StageMetrics:
+    """단계별 소요 시간 히스토그램과 결과(outcome)별 횟수 카운터 (프로세스 전역)"""
+
+    def __init__(self, buckets=STAGE_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        # (단계, 레이블) → [버킷별 개수..., 합계(초), 개수]
+        self._histograms = {}
+        # (단계, 레이블, 결과) → 횟수
+        self._counters = {}
+
+    def observe(self, stage, labels, seconds, outcome):
+        """span 하나 기록"""
+        series = (stage, labels)
+        with self._lock:
+            histogram = self._histograms.get(series)
+            if histogram is None:
+                histogram = [0] * (len(self.buckets) + 2)
+                self._histograms[series] = histogram
+            for index, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    histogram[index] += 1
+                    break
+            histogram[-2] += seconds
+            histogram[-1] += 1
+
+            key = (stage, labels, outcome)
+            self._counters[key] = self._counters.get(key, 0) + 1
+
+    def snapshot(self):
+        """단계별 요약 {단계: {count, total_ms, outcomes}} (레이블은 합쳐서 계산)"""
+        with self._lock:
+            summary = {}
+            for (stage, _), histogram in self._histograms.items():
+                entry = summary.setdefault(stage, {'count': 0, 'total_ms': 0.0, 'outcomes': {}})
+                entry['count'] += histogram[-1]
+                entry['total_ms'] += histogram[-2] * 1000
+            for (stage, _, outcome), count in self._counters.items():
+                outcomes = summary[stage]['outcomes']
+                outcomes[outcome] = outcomes.get(outcome, 0) + count
+            for entry in summary.values():
+                entry['total_ms'] = round(entry['total_ms'], 3)
+            return summary
+
+    def prometheus_text(self):
+        """Prometheus 텍스트 노출 형식 (0.0.4)"""
+        histogram_name = f"{METRIC_PREFIX}_stage_duration_seconds"
+        counter_name = f"{METRIC_PREFIX}_stage_total"
+        lines = [
+            f"# HELP {histogram_name} 렌더링 단계별 소요 시간",
+            f"# TYPE {histogram_name} histogram"
+        ]
+
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+
+        for (stage, labels), histogram in histograms:
+            base = (('stage', stage),) + labels
+            cumulative = 0
+            for bound, count in zip(self.buckets, histogram):
+                cumulative += count
+                lines.append(f"{histogram_name}_bucket{format_labels(base + (('le', repr(bound)),))} {cumulative}")
+            lines.append(f"{histogram_name}_bucket{format_labels(base + (('le', '+Inf'),))} {histogram[-1]}")
+            lines.append(f"{histogram_name}_sum{format_labels(base)} {histogram[-2]:.6f}")
+            lines.append(f"{histogram_name}_count{format_labels(base)} {histogram[-1]}")
+
+        lines.append(f"# HELP {counter_name} 렌더링 단계 실행 횟수 (결과별)")
+        lines.append(f"# TYPE {counter_name} counter")
+        for (stage, labels, outcome), count in counters:
+            lines.append(f"{counter_name}{format_labels((('stage', stage),) + labels + (('outcome', outcome),))} {count}")
+
+        return "\n".join(lines) + "\n"
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+
+class Trace:
+    """작업 하나의 span 기록 (시작 시각은 추적 시작 기준 ms)"""
+
+    def __init__(self, name=None):
+        self.name = name
+        self.created = time.time()
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self.spans = []
+        self.dropped = 0
+
+    def add(self, stage, labels, started, seconds, outcome):
+        entry = {
+            'stage': stage,
+            'start_ms': round((started - self._started) * 1000, 3),
+            'duration_ms': round(seconds * 1000, 3),
+            'outcome': outcome,
+            'thread': threading.current_thread().name
+        }
+        if labels:
+            entry['labels'] = dict(labels)
+        with self._lock:
+            if len(self.spans) >= MAX_TRACE_SPANS:
+                self.dropped += 1
+                return
+            self.spans.append(entry)
+
+    def breakdown(self):
+        """단계별 {count, total_ms} (시간이 긴 순서)
+
+        병렬로 실행된 단계(배경 받기 등)는 각 span 시간을 모두 더하므로 전체 경과 시간보다 클 수 있다.
+        """
+        with self._lock:
+            spans = list(self.spans)
+        summary = {}
+        for span in spans:
+            entry = summary.setdefault(span['stage'], {'count': 0, 'total_ms': 0.0})
+            entry['count'] += 1
+            entry['total_ms'] += span['duration_ms']
+        for entry in summary.values():
+            entry['total_ms'] = round(entry['total_ms'], 3)
+        return dict(sorted(summary.items(), key=lambda item: -item[1]['total_ms']))
+
+    def to_dict(self):
+        with self._lock:
+            spans = list(self.spans)
+        return {
+            'name': self.name,
+            'created': self.created,
+            'elapsed_ms': round((time.perf_counter() - self._started) * 1000, 3),
+            'dropped_spans': self.dropped,
+            'stages': self.breakdown(),
+            'spans': spans
+        }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+
+
+class Span:
+    """진행 중인 span (label()로 레이블 추가, outcome을 바꾸면 결과 카운터에 반영)"""
+
+    __slots__ = ('labels', 'outcome')
+
+    def __init__(self, labels):
+        self.labels = labels
+        self.outcome = "ok"
+
+    def label(self, **labels):
+        self.labels.update(labels)
+
+
+# 앱 전체에서 공유하는 단계별 지표
+stage_metrics = StageMetrics()
+
+_current_trace = contextvars.ContextVar("cardnews_trace", default=None)
+
+
+@contextmanager
+def span(stage, **labels):
+    """단계 하나의 시간 측정 (예외가 나면 outcome="error")
+
+    레이블은 지표 시계열을 나누므로 API 이름·인코더처럼 값의 종류가 적은 것만 쓴다.
+    """
+    current = Span(labels)
+    started = time.perf_counter()
+    try:
+        yield current
+    except BaseException:
+        current.outcome = "error"
+        raise
+    finally:
+        seconds = time.perf_counter() - started
+        frozen = tuple(sorted((name, str(value)) for name, value in current.labels.items()))
+        stage_metrics.observe(stage, frozen, seconds, current.outcome)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add(stage, frozen, started, seconds, current.outcome)
+
+
+@contextmanager
+def trace_job(name=None):
+    """이 블록 안의 span을 새 Trace에 기록"""
+    trace = Trace(name)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+def capture_trace():
+    """현재 추적 (작업 스레드에 넘길 값, 없으면 None)"""
+    return _current_trace.get()
+
+
+@contextmanager
+def use_trace(trace):
+    """작업 스레드에서 호출 측 추적에 기록 (스레드 풀 재사용 시 남지 않도록 블록이 끝나면 되돌림)"""
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
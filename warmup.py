@@ -0,0 +1,130 @@
+"""콜드 스타트 준비 (폰트 설치 확인, 폰트·글자 폭·그라데이션 캐시 미리 채우기)
+
+새 컨테이너의 첫 요청이 폰트 다운로드·TTF 파싱·numpy 임포트·그라데이션 계산을 떠안지 않도록
+프로세스 시작 시(앱·서비스) 또는 배포 단계에서 한 번 실행한다.
+
+사용법:
+    python warmup.py [--no-download] [--all-gradients] [--json]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+from cardnews import (
+    CARD_DARKENING,
+    PLATFORM_SIZES,
+    create_advanced_gradient,
+    install_korean_fonts,
+    preload_platform_fonts,
+    render_text_layer,
+    warm_gradient_templates
+)
+from encoders import encode_image, get_platform_encoder
+from overlay import composite_text_layer
+from reporting import LoggingReporter, set_reporter
+
+# 준비 단계에서 폰트를 네트워크로 받아도 되는지 (0이면 로컬 번들만 사용)
+FONT_DOWNLOAD = os.environ.get("CARDNEWS_FONT_DOWNLOAD", "1") == "1"
+
+# 미리 채울 기본 그라데이션 테마 (앱의 그라데이션 선택 첫 항목)
+WARMUP_GRADIENT_THEME = "블루 그라데이션"
+
+# 글자 폭 테이블을 채울 샘플 (자주 쓰는 음절·숫자·기호)
+WARMUP_SAMPLE_CARD = {
+    'title': "카드뉴스 준비 완료 가이드",
+    'subtitle': "처음 요청도 빠르게",
+    'content': (
+        "• 예산 관리와 비용 절약을 위한 단계별 체크리스트를 정리했습니다.\n"
+        "• 2024년 기준 가격 비교 분석 (할인율 10~30%)\n"
+        "\n"
+        "신혼집 준비 우선순위, 일정 계획, 협상 전략과 선택 기준을 알아보세요!"
+    ),
+    'type': 'content'
+}
+
+
+def prime_imports():
+    """첫 렌더링·첫 다운로드 때 불러오는 무거운 모듈 미리 임포트 (네트워크 연결은 하지 않음)"""
+    import numpy  # noqa: F401 (그라데이션·후처리)
+    from http_client import get_session
+    get_session()
+
+
+def prime_sample_cards():
+    """플랫폼 프리셋마다 샘플 카드를 그리고 인코딩 (글자 폭·텍스트 측정·인코더 초기화)
+
+    텍스트 레이어 캐시에는 넣지 않으므로 실제 카드 캐시 공간을 차지하지 않는다.
+    """
+    for platform, (width, height, _) in PLATFORM_SIZES.items():
+        layer = render_text_layer(WARMUP_SAMPLE_CARD, 1, 1, width, height)
+        if layer is None:
+            return False
+        card = composite_text_layer(create_advanced_gradient(width, height, WARMUP_GRADIENT_THEME, 1, darkening=CARD_DARKENING), layer)
+        encode_image(card, get_platform_encoder(platform))
+    return True
+
+
+def warm_up(download=None, all_gradients=False):
+    """준비 단계 실행 → {'ready', 'fonts', 'steps_ms', 'seconds'}
+
+    ready: 한글 폰트가 모두 있고 샘플 카드까지 그려졌는지
+    download: 폰트가 없을 때 네트워크로 받을지 (기본 FONT_DOWNLOAD)
+    all_gradients: 모든 그라데이션 테마를 미리 계산 (기본은 기본 테마만)
+    """
+    if download is None:
+        download = FONT_DOWNLOAD
+
+    start = time.perf_counter()
+    steps = {}
+
+    def step(name, func):
+        step_start = time.perf_counter()
+        result = func()
+        steps[name] = round((time.perf_counter() - step_start) * 1000, 1)
+        return result
+
+    fonts = step("fonts", lambda: install_korean_fonts(download))
+    fonts_ready = all(status in ("ok", "installed", "downloaded") for status in fonts.values())
+
+    step("font_preload", preload_platform_fonts)
+    step("imports", prime_imports)
+    step("gradients", lambda: warm_gradient_templates(None if all_gradients else [WARMUP_GRADIENT_THEME]))
+    cards_ready = step("sample_cards", prime_sample_cards)
+
+    return {
+        'ready': fonts_ready and cards_ready,
+        'fonts': fonts,
+        'steps_ms': steps,
+        'seconds': round(time.perf_counter() - start, 3)
+    }
+
+
+def describe(result):
+    """준비 결과 한 줄 요약"""
+    fonts = ", ".join(f"{weight}={status}" for weight, status in result['fonts'].items())
+    steps = ", ".join(f"{name} {ms:.0f}ms" for name, ms in result['steps_ms'].items())
+    state = "준비 완료" if result['ready'] else "준비 미완료"
+    return f"{state} {result['seconds']:.2f}s (폰트: {fonts} / {steps})"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="카드뉴스 렌더러 콜드 스타트 준비")
+    parser.add_argument("--no-download", action="store_true", help="폰트를 네트워크로 받지 않음 (로컬 번들만)")
+    parser.add_argument("--all-gradients", action="store_true", help="모든 그라데이션 테마 미리 계산")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    set_reporter(LoggingReporter())
+
+    result = warm_up(download=False if args.no_download else None, all_gradients=args.all_gradients)
+    print(json.dumps(result, ensure_ascii=False, indent=2) if args.json else describe(result))
+    return 0 if result['ready'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())